@@ -0,0 +1,49 @@
+"""Micro-benchmark for converting NLU-Evaluation Corpora entities, run with `python -m benchmarks.bench_corpora`."""
+import timeit
+from typing import Callable
+
+from nlu_datasets.utils import convert_json_dict, get_path  # before corpora to avoid a circular ImportError
+from nlu_datasets.corpora import convert_index, get_spans
+from nlu_datasets.my_types import Corpus
+from nltk.tokenize import WordPunctTokenizer
+
+
+def convert_sentences_per_index(sentences: list):
+    """Previous implementation: a new tokenizer and a new tokenization for every index."""
+    def index(text: str, token_index: int, start: bool) -> int:
+        spans = list(WordPunctTokenizer().span_tokenize(text))
+        return spans[token_index][0 if start else 1]
+
+    for sentence in sentences:
+        for entity in sentence['entities']:
+            index(sentence['text'], entity['start'], True)
+            index(sentence['text'], entity['stop'], False)
+
+
+def convert_sentences_per_sentence(sentences: list):
+    for sentence in sentences:
+        if sentence['entities']:
+            spans = get_spans(sentence['text'])
+            for entity in sentence['entities']:
+                convert_index(sentence['text'], entity['start'], True, spans)
+                convert_index(sentence['text'], entity['stop'], False, spans)
+
+
+def measure(function: Callable, sentences: list, repeat: int = 5, number: int = 20) -> float:
+    """Best time in seconds for converting all sentences once."""
+    return min(timeit.repeat(lambda: function(sentences), repeat=repeat, number=number)) / number
+
+
+def main():
+    print('{:<16} {:>9} {:>12} {:>14} {:>8}'.format('corpus', 'entities', 'per index', 'per sentence', 'speedup'))
+    for corpus in [Corpus.ASKUBUNTU, Corpus.CHATBOT, Corpus.WEBAPPLICATIONS]:
+        sentences = convert_json_dict(get_path(corpus))['sentences']
+        n_entities = sum(len(s['entities']) for s in sentences)
+        before = measure(convert_sentences_per_index, sentences)
+        after = measure(convert_sentences_per_sentence, sentences)
+        print('{:<16} {:>9} {:>10.2f}ms {:>12.2f}ms {:>7.1f}x'.format(
+            corpus.name.lower(), n_entities, before * 1000, after * 1000, before / after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Startup time of the nlu_datasets modules based on `python -X importtime`.
+
+Run with `python -m benchmarks.bench_import [--max-ms 50]`, exits with 1 when a module takes longer than --max-ms to
+import or pulls in one of the heavy dependencies.
+"""
+import argparse
+import subprocess
+import sys
+from typing import Dict, List
+
+from nlu_datasets.utils import get_project_root
+
+MODULES = ['nlu_datasets.utils', 'nlu_datasets.corpora', 'nlu_datasets.snips', 'nlu_datasets.converter',
+           'nlu_datasets.markdown', 'nlu_datasets.generate', 'nlu_datasets.disk_cache']
+HEAVY = ['pandas', 'numpy', 'rasa_nlu', 'nltk', 'tests']  # should only be imported when they are used
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """Cumulative import time in microseconds of every module imported by `import module` in a fresh interpreter."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+                            cwd=str(get_project_root()), stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def heavy_imports(times: Dict[str, int]) -> List[str]:
+    return sorted(name for name in times if name.split('.')[0] in HEAVY)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--max-ms', type=float, default=None, help='fail when an import takes longer')
+    args = parser.parse_args()
+
+    failed = False
+    print('{:<26} {:>10}  {}'.format('module', 'time', 'heavy imports'))
+    for module in MODULES:
+        times = import_times(module)
+        ms = times[module] / 1000
+        heavy = heavy_imports(times)
+        print('{:<26} {:>8.1f}ms  {}'.format(module, ms, ', '.join(heavy) if heavy else '-'))
+        failed |= bool(heavy) or (args.max_ms is not None and ms > args.max_ms)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""Load time of SNIPS2017 and SNIPS2017_FULL for serial and concurrent reading of the intent files.
+
+Run with `python -m benchmarks.bench_snips [--workers 4]`.
+"""
+import argparse
+import os
+import timeit
+
+import nlu_datasets.utils  # before snips to avoid a circular ImportError
+from nlu_datasets.my_types import Corpus
+from nlu_datasets.snips import read_snips2017
+
+
+def measure(corpus: Corpus, workers: int, executor: str, repeat: int) -> float:
+    """Best time in seconds for reading corpus."""
+    return min(timeit.repeat(lambda: tuple(read_snips2017(corpus, workers, executor)), repeat=repeat, number=1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print('{} CPUs, {} workers'.format(os.cpu_count(), args.workers))
+    print('{:<16} {:>10} {:>10} {:>10}'.format('corpus', 'serial', 'thread', 'process'))
+    for corpus in [Corpus.SNIPS2017, Corpus.SNIPS2017_FULL]:
+        serial = measure(corpus, 1, 'thread', args.repeat)
+        threads = measure(corpus, args.workers, 'thread', args.repeat)
+        processes = measure(corpus, args.workers, 'process', args.repeat)
+        print('{:<16} {:>8.0f}ms {:>8.0f}ms {:>8.0f}ms'.format(
+            corpus.name.lower(), serial * 1000, threads * 1000, processes * 1000))
+
+
+if __name__ == '__main__':
+    main()
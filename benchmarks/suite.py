@@ -0,0 +1,199 @@
+"""Benchmark suite for the load, convert and export hot paths, reporting sentences/s and peak memory.
+
+Run with `python -m benchmarks.suite [--scale 100 --scale 1000] [--filter write_ner] [--save baseline.json]` and
+compare a later run against the saved baseline with `--compare baseline.json`, which exits with 1 when a workload got
+slower or needs more memory than --tolerance allows. Baselines are only comparable on the same machine.
+
+Workloads are named <stage>/<corpus>[/<task>]. The scale-up corpora snips2017x<k> repeat the SNIPS2017 sentences k
+times to measure how the stages behave on corpora much larger than the ones in data/. The input of a workload is only
+built when the workload passes --filter.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+from nlu_datasets.utils import convert_json_dict, get_corpus, get_messages, get_path, load_corpus
+from nlu_datasets.converter import convert_message_to_annotated_str, merge_spans, message_spans, write_split_ner
+from nlu_datasets.corpora import convert_index, get_spans
+from nlu_datasets.my_types import Corpus, Task
+
+NLU_EVALUATION = [Corpus.ASKUBUNTU, Corpus.CHATBOT, Corpus.WEBAPPLICATIONS]
+CORPORA = NLU_EVALUATION + [Corpus.SNIPS2017, Corpus.SNIPS2017_FULL]
+DEFAULT_SCALES = (10,)
+DEFAULT_TOLERANCE = 0.2
+
+
+class Workload(NamedTuple):
+    name: str
+    sentences: int  # sentences processed by one call of run
+    run: Callable[[], object]
+
+
+Factory = Tuple[str, Callable[[], Workload]]  # (name, builds the input and returns the workload of that name)
+
+
+def load_uncached(corpus: Corpus):
+    """Parse corpus from data/ without the memory and disk caches."""
+    previous = os.environ.get('NLU_DATASETS_CACHE_DIR')
+    os.environ['NLU_DATASETS_CACHE_DIR'] = ''
+    try:
+        return load_corpus(corpus)
+    finally:
+        if previous is None:
+            del os.environ['NLU_DATASETS_CACHE_DIR']
+        else:
+            os.environ['NLU_DATASETS_CACHE_DIR'] = previous
+
+
+def convert_indices(sentences: List[dict]):
+    for sentence in sentences:
+        if sentence['entities']:
+            spans = get_spans(sentence['text'])
+            for entity in sentence['entities']:
+                convert_index(sentence['text'], entity['start'], True, spans)
+                convert_index(sentence['text'], entity['stop'], False, spans)
+
+
+def merge_all_spans(messages: Sequence):
+    for message in messages:
+        merge_spans(message_spans(message), message.data.get('entities', []))
+
+
+def annotate_all(messages: Sequence):
+    for message in messages:
+        convert_message_to_annotated_str(message)
+
+
+def write_task(messages: Sequence, task: Task):
+    with tempfile.TemporaryDirectory() as directory:
+        write_split_ner(messages, {task: Path(directory)})
+
+
+@lru_cache(maxsize=1)  # shared by the workloads of one corpus, which follow each other
+def get_scaled_messages(corpus: Corpus, scale: int) -> Sequence:
+    return get_messages(corpus) * scale
+
+
+def get_message_workloads(name: str, corpus: Corpus, scale: int = 1) -> List[Factory]:
+    def factory(stage: str, run: Callable[[Sequence], object]) -> Factory:
+        def build() -> Workload:
+            messages = get_scaled_messages(corpus, scale)
+            return Workload(stage, len(messages), lambda: run(messages))
+
+        return stage, build
+
+    factories = [factory('merge_spans/' + name, merge_all_spans), factory('annotate/' + name, annotate_all)]
+    for task in Task:
+        factories.append(factory('write_ner/{}/{}'.format(name, task.name.lower()),
+                                 lambda messages, task=task: write_task(messages, task)))
+    return factories
+
+
+def get_corpus_workload(name: str, corpus: Corpus, run: Callable[[Corpus], object]) -> Factory:
+    return name, lambda: Workload(name, len(get_corpus(corpus)), lambda: run(corpus))
+
+
+def get_convert_index_workload(corpus: Corpus) -> Workload:
+    sentences = convert_json_dict(get_path(corpus))['sentences']
+    return Workload('convert_index/' + corpus.name.lower(), len(sentences), lambda: convert_indices(sentences))
+
+
+def get_workloads(scales: Iterable[int] = DEFAULT_SCALES) -> List[Factory]:
+    """Names and factories of all workloads, a factory builds the input of its workload when it is called."""
+    factories = []
+    for corpus in NLU_EVALUATION:
+        factories.append(('convert_index/' + corpus.name.lower(),
+                          lambda corpus=corpus: get_convert_index_workload(corpus)))
+    for corpus in CORPORA:
+        name = corpus.name.lower()
+        factories.append(get_corpus_workload('load/' + name, corpus, load_uncached))
+        factories.append(get_corpus_workload('load_cached/' + name, corpus, load_corpus))
+        factories.append(get_corpus_workload('get_messages/' + name, corpus, get_messages))
+        factories.extend(get_message_workloads(name, corpus))
+    for scale in scales:
+        factories.extend(get_message_workloads('snips2017x{}'.format(scale), Corpus.SNIPS2017, scale))
+    return factories
+
+
+def measure(workload: Workload, repeat: int) -> Dict[str, float]:
+    """Best throughput of repeat runs and the peak of memory allocated by Python during one more run.
+
+    A first untimed run imports modules and fills lazily created state like the tokenizer.
+    """
+    workload.run()
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        workload.run()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        workload.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'sentences': workload.sentences, 'sentences_per_s': workload.sentences / best,
+            'peak_mib': peak / (1 << 20)}
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Descriptions of the workloads in results which regressed compared to baseline."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        expected = baseline[name]
+        if result['sentences_per_s'] < expected['sentences_per_s'] * (1 - tolerance):
+            regressions.append('{}: {:.0f} sentences/s, baseline {:.0f}'.format(
+                name, result['sentences_per_s'], expected['sentences_per_s']))
+        if result['peak_mib'] > expected['peak_mib'] * (1 + tolerance) + 0.1:  # ignore noise of tiny workloads
+            regressions.append('{}: {:.1f} MiB peak, baseline {:.1f} MiB'.format(
+                name, result['peak_mib'], expected['peak_mib']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, action='append', default=None,
+                        help='size of a scale-up corpus in multiples of SNIPS2017, can be repeated, defaults to 10')
+    parser.add_argument('--filter', default='', help='only run workloads whose name contains this string')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--save', type=Path, default=None, help='write the results as baseline to this file')
+    parser.add_argument('--compare', type=Path, default=None, help='baseline file to compare against')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='allowed relative slowdown or memory increase, default %(default)s')
+    args = parser.parse_args()
+
+    results = {}
+    print('{:<40} {:>10} {:>14} {:>10}'.format('workload', 'sentences', 'sentences/s', 'peak'))
+    for name, factory in get_workloads(args.scale if args.scale else DEFAULT_SCALES):
+        if args.filter not in name:
+            continue
+        workload = factory()
+        results[workload.name] = result = measure(workload, args.repeat)
+        print('{:<40} {:>10} {:>14.0f} {:>7.1f}MiB'.format(
+            workload.name, result['sentences'], result['sentences_per_s'], result['peak_mib']))
+
+    if args.save:
+        with open(str(args.save), 'w', encoding='utf8') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(), 'results': results},
+                      f, indent=2, sort_keys=True)
+            f.write('\n')
+    if args.compare:
+        with open(str(args.compare), 'r', encoding='utf8') as f:
+            regressions = compare(results, json.load(f)['results'], args.tolerance)
+        for regression in regressions:
+            print('REGRESSION ' + regression)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Asynchronous counterparts of utils.get_corpus and utils.get_messages for asyncio applications.
+
+Reading and parsing run in an executor, the default thread pool unless one is given, so the event loop is not
+blocked. Concurrent calls for the same corpus on an event loop share a single load. Loaded corpora are cached by
+utils.get_corpus like for the synchronous API.
+"""
+import asyncio
+import weakref
+from concurrent.futures import Executor
+from typing import AsyncIterator, List, Tuple, TYPE_CHECKING
+
+from nlu_datasets.my_types import Corpus
+from nlu_datasets.utils import get_corpus
+
+if TYPE_CHECKING:  # rasa_nlu is only imported once messages are built
+    from rasa_nlu.training_data.message import Message
+    from nlu_datasets.compact import CompactCorpus
+
+CHUNK_SIZE = 256  # messages built per executor call by aiter_messages
+
+_loads = weakref.WeakKeyDictionary()  # event loop -> {Corpus: future of the load in flight on that loop}
+
+
+async def aget_corpus(corpus: Corpus, executor: Executor = None) -> 'CompactCorpus':
+    """get_corpus without blocking the event loop, joining a load of the same corpus which is in flight.
+
+    Cancelling one caller does not cancel the load for the others.
+    """
+    loop = asyncio.get_running_loop()
+    loads = _loads.setdefault(loop, {})
+    future = loads.get(corpus)
+    if future is None:
+        future = loop.run_in_executor(executor, get_corpus, corpus)
+        loads[corpus] = future
+        future.add_done_callback(lambda _: loads.pop(corpus, None))
+    return await asyncio.shield(future)
+
+
+async def aget_messages(corpus: Corpus, executor: Executor = None) -> Tuple['Message', ...]:
+    """get_messages without blocking the event loop."""
+    compact = await aget_corpus(corpus, executor)
+    return await asyncio.get_running_loop().run_in_executor(executor, compact.to_messages)
+
+
+def build_messages(compact: 'CompactCorpus', start: int, stop: int) -> List['Message']:
+    return [compact.get_message(i) for i in range(start, stop)]
+
+
+async def aiter_messages(corpus: Corpus, executor: Executor = None,
+                         chunk_size: int = CHUNK_SIZE) -> AsyncIterator['Message']:
+    """Messages of corpus, built chunk_size at a time in the executor."""
+    compact = await aget_corpus(corpus, executor)
+    loop = asyncio.get_running_loop()
+    for start in range(0, len(compact), chunk_size):
+        messages = await loop.run_in_executor(executor, build_messages, compact, start,
+                                              min(start + chunk_size, len(compact)))
+        for message in messages:
+            yield message
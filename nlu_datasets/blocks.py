@@ -0,0 +1,144 @@
+"""Random access to the sentence blocks of the generated NER files.
+
+Blocks are separated by a blank line. BlockWriter records the byte range of every block while writing and saves it
+to an index file next to the output, e.g. train.txt.idx next to train.txt. BlockReader memory-maps both files, so
+any block or slice of consecutive blocks is found without reading or parsing the rest of the file.
+
+The index is a little-endian array of unsigned 64 bit integers: MAGIC, the number of blocks n, the file size and
+then the start and end offset of each of the n blocks.
+"""
+import mmap
+import sys
+from array import array
+from pathlib import Path
+from typing import BinaryIO, List, Union
+
+MAGIC = int.from_bytes(b'NLUBLOCK', 'little')
+SEPARATOR = '\n\n'
+HEADER = 3  # MAGIC, n, file size
+
+
+def get_index_path(filename: Path) -> Path:
+    return filename.with_name(filename.name + '.idx')
+
+
+class BlockWriter:
+    """Writes blocks to a binary file, separated by SEPARATOR, and their offsets to the index on close."""
+
+    def __init__(self, filename: Path, buffering: int = -1):
+        self.filename = filename
+        self.file = open(str(filename), 'wb', buffering=buffering)  # type: BinaryIO
+        self.offsets = array('Q')
+        self.position = 0
+
+    def write(self, block: str):
+        if self.offsets:
+            self.position += self.file.write(SEPARATOR.encode('utf8'))
+        self.offsets.append(self.position)
+        self.position += self.file.write(block.encode('utf8'))
+        self.offsets.append(self.position)
+
+    def close(self):
+        self.file.close()
+        write_index(get_index_path(self.filename), self.offsets, self.position)
+
+    def __enter__(self) -> 'BlockWriter':
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.close()
+        else:
+            self.file.close()
+
+
+def to_little_endian(values: array) -> array:
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def write_index(filename: Path, offsets: array, size: int):
+    with open(str(filename), 'wb') as f:
+        to_little_endian(array('Q', [MAGIC, len(offsets) // 2, size])).tofile(f)
+        to_little_endian(offsets).tofile(f)
+
+
+def build_index(filename: Path):
+    """Writes the index for an existing file, e.g. one generated before indices were written."""
+    with open(str(filename), 'r', encoding='utf8', newline='') as f:
+        blocks = f.read().split(SEPARATOR)
+    with BlockWriter(filename) as writer:
+        for block in blocks:
+            writer.write(block)
+
+
+class BlockReader:
+    """Memory-mapped sentence blocks of filename, use as a sequence of strings.
+
+    reader[i] decodes block i, reader[i:j] the blocks i to j - 1 and get_bytes(i, j) returns the raw bytes of these
+    blocks including the separators between them.
+    """
+
+    def __init__(self, filename: Path):
+        self.filename = filename
+        self.file = open(str(filename), 'rb')
+        self.index_file = open(str(get_index_path(filename)), 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.size_of(self.file) else b''
+            self.index = memoryview(mmap.mmap(self.index_file.fileno(), 0, access=mmap.ACCESS_READ)).cast('Q')
+            self.check()
+        except (ValueError, TypeError):
+            self.close()
+            raise
+
+    @staticmethod
+    def size_of(f: BinaryIO) -> int:
+        f.seek(0, 2)
+        return f.tell()
+
+    def check(self):
+        if sys.byteorder == 'big':
+            raise ValueError('memory-mapped indices are only supported on little-endian machines')
+        if len(self.index) < HEADER or self.index[0] != MAGIC:
+            raise ValueError('{} is not a block index'.format(get_index_path(self.filename)))
+        if len(self.index) != HEADER + 2 * self.index[1] or self.index[2] != len(self.data):
+            raise ValueError('index of {} is out of date, call build_index'.format(self.filename))
+
+    def __len__(self) -> int:
+        return self.index[1]
+
+    def get_range(self, i: int, j: int) -> slice:
+        """Byte range from the start of block i to the end of block j - 1."""
+        if not 0 <= i < j <= len(self):
+            raise IndexError('blocks {}:{} out of range for {} blocks'.format(i, j, len(self)))
+        return slice(self.index[HEADER + 2 * i], self.index[HEADER + 2 * j - 1])
+
+    def get_bytes(self, i: int, j: int = None) -> bytes:
+        return self.data[self.get_range(i, i + 1 if j is None else j)]
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(item, slice):
+            return [self[k] for k in range(*item.indices(len(self)))]
+        if item < 0:
+            item += len(self)
+        return self.get_bytes(item).decode('utf8')
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self):
+        if hasattr(self, 'index'):
+            self.index.release()
+        if isinstance(getattr(self, 'data', None), mmap.mmap):
+            self.data.close()
+        self.file.close()
+        self.index_file.close()
+
+    def __enter__(self) -> 'BlockReader':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,80 @@
+"""Writes a corpus as Parquet file with typed columns, requires the optional dependency pyarrow.
+
+Columns:
+    text        string, the sentence
+    annotated   string, the sentence in Rasa Markdown like the first column of the TSV files
+    intent      dictionary<int16, string>
+    training    bool
+    entities    list<struct<start: int32, end: int32, entity: string, value: string>>
+
+The file is written in row groups of row_group_size sentences, so readers can select columns and row groups, e.g.
+pyarrow.parquet.ParquetFile(filename).read_row_group(0, columns=['intent', 'training']).
+"""
+from pathlib import Path
+from typing import Iterator, TYPE_CHECKING
+
+from nlu_datasets.markdown import annotate, remove_brackets
+from nlu_datasets.my_types import Corpus
+
+if TYPE_CHECKING:
+    import pyarrow
+    from nlu_datasets.compact import CompactCorpus
+
+ROW_GROUP_SIZE = 4096  # sentences per row group
+
+
+def get_schema() -> 'pyarrow.Schema':
+    import pyarrow as pa
+
+    entity = pa.struct([pa.field('start', pa.int32()), pa.field('end', pa.int32()),
+                        pa.field('entity', pa.string()), pa.field('value', pa.string())])
+    return pa.schema([pa.field('text', pa.string()), pa.field('annotated', pa.string()),
+                      pa.field('intent', pa.dictionary(pa.int16(), pa.string())),
+                      pa.field('training', pa.bool_()), pa.field('entities', pa.list_(entity))])
+
+
+def build_batch(compact: 'CompactCorpus', start: int, stop: int) -> 'pyarrow.RecordBatch':
+    """Columns of the sentences start to stop - 1, built from the arrays of compact."""
+    import pyarrow as pa
+
+    texts = [compact.get_text(i) for i in range(start, stop)]
+    annotated = [annotate(remove_brackets(text), compact.get_entities(i)) for i, text in zip(range(start, stop), texts)]
+    intents = pa.DictionaryArray.from_arrays(pa.array(compact.intent_codes[start:stop].tolist(), pa.int16()),
+                                             pa.array(list(compact.intents), pa.string()))
+    training = pa.array([bool(flag) for flag in compact.training[start:stop]], pa.bool_())
+
+    first, last = compact.entity_offsets[start], compact.entity_offsets[stop]
+    values = [compact.values[compact.value_offsets[j]:compact.value_offsets[j + 1]] for j in range(first, last)]
+    entity_types = [compact.entity_types[code] for code in compact.entity_type_codes[first:last]]
+    structs = pa.StructArray.from_arrays([pa.array(compact.entity_starts[first:last].tolist(), pa.int32()),
+                                          pa.array(compact.entity_ends[first:last].tolist(), pa.int32()),
+                                          pa.array(entity_types, pa.string()),
+                                          pa.array(values, pa.string())],
+                                         ['start', 'end', 'entity', 'value'])
+    offsets = pa.array([offset - first for offset in compact.entity_offsets[start:stop + 1]], pa.int32())
+    entities = pa.ListArray.from_arrays(offsets, structs)
+
+    return pa.RecordBatch.from_arrays([pa.array(texts, pa.string()), pa.array(annotated, pa.string()), intents,
+                                       training, entities], get_schema().names)
+
+
+def iter_batches(compact: 'CompactCorpus', batch_size: int = ROW_GROUP_SIZE) -> Iterator['pyarrow.RecordBatch']:
+    for start in range(0, len(compact), batch_size):
+        yield build_batch(compact, start, min(start + batch_size, len(compact)))
+
+
+def write_parquet(compact: 'CompactCorpus', filename: Path, row_group_size: int = ROW_GROUP_SIZE):
+    """Writes compact to filename, one row group per batch of row_group_size sentences."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with pq.ParquetWriter(str(filename), get_schema()) as writer:
+        for batch in iter_batches(compact, row_group_size):
+            writer.write_table(pa.Table.from_batches([batch]))
+
+
+def to_parquet(corpus: Corpus, filename: Path, row_group_size: int = ROW_GROUP_SIZE):
+    """Write corpus to Parquet file specified by Path, the columnar counterpart of converter.to_tsv."""
+    from nlu_datasets.utils import get_corpus
+
+    write_parquet(get_corpus(corpus), filename, row_group_size)
@@ -0,0 +1,178 @@
+"""Compact in-memory representation of a parsed corpus.
+
+A corpus of rasa Message objects costs a Message, two dicts and a dict per entity for every sentence. CompactCorpus
+instead stores all sentences in a few flat arrays: the concatenated texts with their offsets, intents and entity types
+as codes into a table of names, the training flags and the entity spans. Message objects are only created when they
+are requested, so they can be garbage collected as soon as the caller is done with them.
+"""
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+from nlu_datasets.my_types import Corpus
+
+if TYPE_CHECKING:  # rasa_nlu is only imported once messages are built
+    from rasa_nlu.training_data.message import Message
+    from nlu_datasets.index import CorpusIndex
+
+
+class Codes:
+    """Assigns consecutive codes to names, used to store intents and entity types as small integers."""
+
+    def __init__(self):
+        self.names = []  # type: List[str]
+        self.codes = {}  # type: Dict[str, int]
+
+    def encode(self, name: str) -> int:
+        if name not in self.codes:
+            self.codes[name] = len(self.names)
+            self.names.append(name)
+        return self.codes[name]
+
+
+class CompactCorpus:
+    """Sentences of a corpus stored in flat arrays, indexing returns a Message view of a sentence."""
+
+    __slots__ = ('corpus', 'text', 'text_offsets', 'intents', 'intent_codes', 'training',
+                 'entity_offsets', 'entity_starts', 'entity_ends', 'entity_types', 'entity_type_codes',
+                 'values', 'value_offsets', 'inverted_index')
+
+    def __init__(self, corpus: Optional[Corpus] = None):
+        self.corpus = corpus  # stored in Message.data['corpus'] of the views when set
+        self.text = ''  # all texts concatenated, text i is text[text_offsets[i]:text_offsets[i + 1]]
+        self.text_offsets = array('i', [0])
+        self.intents = ()  # type: Tuple[str, ...]
+        self.intent_codes = array('H')
+        self.training = array('b')
+        self.entity_offsets = array('i', [0])  # entities of sentence i are entity_offsets[i]:entity_offsets[i + 1]
+        self.entity_starts = array('i')
+        self.entity_ends = array('i')
+        self.entity_types = ()  # type: Tuple[str, ...]
+        self.entity_type_codes = array('H')
+        self.values = ''  # entity values concatenated like the texts
+        self.value_offsets = array('i', [0])
+        self.inverted_index = None  # type: Optional[CorpusIndex]
+
+    @classmethod
+    def from_messages(cls, messages: Iterable['Message'], corpus: Optional[Corpus] = None) -> 'CompactCorpus':
+        """Build from messages having an intent and a training flag, corpus is taken from the messages if not given."""
+        return cls.from_records(((message.text, message.data) for message in messages), corpus)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Tuple[str, dict]], corpus: Optional[Corpus] = None) -> 'CompactCorpus':
+        """Build from (text, data) pairs like Message.text and Message.data, without importing rasa_nlu."""
+        compact = cls(corpus)
+        texts, values = [], []
+        intents, entity_types = Codes(), Codes()
+        for text, data in records:
+            if compact.corpus is None:
+                compact.corpus = data.get('corpus')
+            texts.append(text)
+            compact.text_offsets.append(compact.text_offsets[-1] + len(text))
+            compact.intent_codes.append(intents.encode(data.get('intent', '')))
+            compact.training.append(data['training'])
+            for entity in data.get('entities', []):
+                compact.entity_starts.append(entity['start'])
+                compact.entity_ends.append(entity['end'])
+                compact.entity_type_codes.append(entity_types.encode(entity['entity']))
+                values.append(entity['value'])
+                compact.value_offsets.append(compact.value_offsets[-1] + len(entity['value']))
+            compact.entity_offsets.append(len(compact.entity_starts))
+        compact.text = ''.join(texts)
+        compact.values = ''.join(values)
+        compact.intents = tuple(intents.names)
+        compact.entity_types = tuple(entity_types.names)
+        return compact
+
+    def __len__(self) -> int:
+        return len(self.training)
+
+    def index(self, i: int) -> int:
+        """Positive index for i, raises IndexError like a tuple would."""
+        n = len(self)
+        if not -n <= i < n:
+            raise IndexError('sentence index out of range')
+        return i + n if i < 0 else i
+
+    def get_text(self, i: int) -> str:
+        i = self.index(i)
+        return self.text[self.text_offsets[i]:self.text_offsets[i + 1]]
+
+    def get_texts(self) -> List[str]:
+        offsets = self.text_offsets
+        return [self.text[offsets[i]:offsets[i + 1]] for i in range(len(self))]
+
+    def get_intent(self, i: int) -> str:
+        return self.intents[self.intent_codes[i]]
+
+    def is_training(self, i: int) -> bool:
+        return bool(self.training[i])
+
+    def get_entities(self, i: int) -> List[dict]:
+        """Entities of sentence i in the representation of nlu_datasets.utils.create_entity."""
+        i = self.index(i)
+        entities = []
+        for j in range(self.entity_offsets[i], self.entity_offsets[i + 1]):
+            value = self.values[self.value_offsets[j]:self.value_offsets[j + 1]]
+            entity = self.entity_types[self.entity_type_codes[j]]
+            entities.append({'start': self.entity_starts[j], 'end': self.entity_ends[j], 'entity': entity,
+                             'value': value})
+        return entities
+
+    def get_data(self, i: int) -> dict:
+        """Message.data of sentence i, having the same keys as the data of the original message."""
+        data = {}
+        intent = self.get_intent(i)
+        if intent:
+            data['intent'] = intent
+        entities = self.get_entities(i)
+        if entities:
+            data['entities'] = entities
+        data['training'] = self.is_training(i)
+        if self.corpus is not None:
+            data['corpus'] = self.corpus
+        return data
+
+    def get_message(self, i: int) -> 'Message':
+        from rasa_nlu.training_data.message import Message
+
+        return Message(self.get_text(i), self.get_data(i))
+
+    def __getitem__(self, i: int) -> 'Message':
+        return self.get_message(i)
+
+    def __iter__(self) -> Iterator['Message']:
+        return map(self.get_message, range(len(self)))
+
+    def to_messages(self) -> Tuple['Message', ...]:
+        return tuple(self)
+
+    def __getstate__(self) -> dict:
+        # encoding explicitly, pickling a str would keep a cached utf8 copy of the texts alive in this object
+        state = {name: getattr(self, name) for name in self.__slots__ if name != 'inverted_index'}
+        state['text'] = self.text.encode('utf8')
+        state['values'] = self.values.encode('utf8')
+        return state
+
+    def __setstate__(self, state: dict):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.inverted_index = None  # rebuilt on demand instead of pickled
+        self.text = state['text'].decode('utf8')
+        self.values = state['values'].decode('utf8')
+
+    def get_index(self) -> 'CorpusIndex':
+        """Inverted index of this corpus, built on first use and kept with the corpus."""
+        if self.inverted_index is None:
+            from nlu_datasets.index import CorpusIndex
+
+            self.inverted_index = CorpusIndex(self)
+        return self.inverted_index
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the arrays and strings of this corpus."""
+        arrays = [self.text_offsets, self.intent_codes, self.training, self.entity_offsets, self.entity_starts,
+                  self.entity_ends, self.entity_type_codes, self.value_offsets]
+        names = self.intents + self.entity_types
+        return sys.getsizeof(self.text) + sys.getsizeof(self.values) + \
+            sum(a.itemsize * len(a) for a in arrays) + sum(map(sys.getsizeof, names))
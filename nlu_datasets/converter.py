@@ -1,28 +1,25 @@
 import csv
 from pathlib import Path
-from typing import Tuple, Iterable, List
-
-from rasa_nlu.training_data import TrainingData
-from rasa_nlu.training_data.formats.markdown import MarkdownWriter
-from rasa_nlu.training_data.message import Message
+from contextlib import ExitStack
+from typing import Tuple, Iterable, List, TextIO, Dict, TYPE_CHECKING
 
+from nlu_datasets.blocks import BlockWriter
 from nlu_datasets.my_types import Corpus, Task
-from nlu_datasets.utils import get_project_root, get_messages
-from nltk.tokenize import WordPunctTokenizer
+from nlu_datasets.utils import get_messages
+from nlu_datasets.corpora import get_spans
+from nlu_datasets.markdown import annotate, remove_brackets
 import os
 
+if TYPE_CHECKING:  # rasa_nlu is only imported once messages are built
+    from rasa_nlu.training_data.message import Message
+
 
-def convert_message_to_annotated_str(message: Message) -> str:
-    """Convert Message object to string having annotated entities."""
-    message.text = message.text.replace('(', '').replace(')', '').replace('[', '').replace(']', '')
-    training_examples = [message]
-    training_data = TrainingData(training_examples=training_examples)
-    generated = MarkdownWriter()._generate_training_examples_md(training_data)
-    generated = generated[generated.find('\n') + 3:-1]  # removes header
-    return generated
+def convert_message_to_annotated_str(message: 'Message') -> str:
+    """Convert Message object to string having annotated entities, brackets are removed from the text."""
+    return annotate(remove_brackets(message.text), message.data.get('entities', []))
 
 
-def convert_message_line(message: Message) -> Tuple:
+def convert_message_line(message: 'Message') -> Tuple:
     """Convert message to tuple which can be stored in tsv."""
     text = convert_message_to_annotated_str(message)
     base_row = (text, message.data['intent'])
@@ -52,68 +49,107 @@ def to_tsv(corpus: Corpus, filename: Path):
     write_tsv(tuples, n, filename)
 
 
-def annotate_entity_tokens(entity: dict) -> List[str]:
-    """Create NER annotations for given entity."""
-    span_generator = WordPunctTokenizer().span_tokenize(entity['value'])
-    spans = [span for span in span_generator]
+def annotate_entity_tokens(entity: dict, n_tokens: int = None, corpus: Corpus = None) -> List[str]:
+    """Create NER annotations for given entity.
+
+    n_tokens is the number of tokens in the entity value, the value is only tokenized when it is not given.
+    """
+    if n_tokens is None:
+        n_tokens = len(get_spans(entity['value'], corpus))
     entity_name = entity['entity']
-    annotations = map(lambda i: ('B-' if i == 0 else 'I-') + entity_name, range(len(spans)))
-    return list(annotations)
+    return ['B-' + entity_name] + ['I-' + entity_name] * (n_tokens - 1) if n_tokens else []
 
 
-def merge_spans(spans: List[Tuple], entities: List[dict]) -> List[Tuple]:
-    """Merge spans which are covered by some entity."""
-    start_indexes = list(map(lambda e: e['start'], entities))
-    end_indexes = list(map(lambda e: e['end'], entities))
+def merge_span_counts(spans: List[Tuple], entities: List[dict]) -> List[Tuple[Tuple, int]]:
+    """Like merge_spans, but also returns how many of the spans each merged span covers."""
+    start_indexes = set(e['start'] for e in entities)
+    end_indexes = set(e['end'] for e in entities)
     merged = []
     start = 0
+    count = 0  # spans since the last start match, these are the spans covered by (start, span[1])
     skip = False
     for span in spans:
         start_match = span[0] in start_indexes
         end_match = span[1] in end_indexes
+        count = 1 if start_match else count + 1
         if start_match:
             start = span[0]
             skip = True
         if end_match:
-            merged.append((start, span[1]))
+            merged.append(((start, span[1]), count))
             skip = False
         if not (start_match or end_match or skip):
-            merged.append(span)
+            merged.append((span, 1))
     return merged
 
 
+def merge_spans(spans: List[Tuple], entities: List[dict]) -> List[Tuple]:
+    """Merge spans which are covered by some entity."""
+    return [span for span, _ in merge_span_counts(spans, entities)]
+
+
+def covers_value(text: str, span: Tuple, entity: dict) -> bool:
+    """Whether span of text is exactly the entity, ignoring the decapitalization of text."""
+    value = entity['value']
+    covered = text[span[0]:span[1]]
+    return (span[0], span[1]) == (entity['start'], entity['end']) and \
+        (covered == value or (len(covered) == len(value) and covered == value.lower()))
+
+
 # i need a connection from [harras](StationStart) to [karl-preis-platz](StationDest) at [8 am](TimeStartTime).
-def annotate_tokens_using_ner(spans: List[Tuple], entities: List[dict]) -> List[str]:
-    """Use entities to create NER annotations for given spans."""
-    merged_spans = merge_spans(spans, entities)
-    start_indexes = list(map(lambda e: e['start'], entities))
+def annotate_tokens_using_ner(spans: List[Tuple], entities: List[dict], text: str = None,
+                              corpus: Corpus = None) -> List[str]:
+    """Use entities to create NER annotations for given spans.
+
+    When the text is given the number of tokens of an entity is taken from spans in a single sweep. Entity values
+    are then only tokenized when they do not match the text, for example due to an incorrect start index.
+    """
+    entities_by_start = {}
+    for entity in entities:
+        entities_by_start.setdefault(entity['start'], entity)  # the first entity wins, as it did with filter
     annotations = []
-    for span in merged_spans:
-        start = span[0]
-        if start in start_indexes:
-            entity = list(filter(lambda e: e['start'] == start, entities))[0]
-            annotations.append(annotate_entity_tokens(entity))
-        else:
+    for span, count in merge_span_counts(spans, entities):
+        entity = entities_by_start.get(span[0])
+        if entity is None:
             annotations.append('O')
-    annotations = [item for sublist in annotations for item in sublist]  # flatten list
+        elif text is not None and covers_value(text, span, entity):
+            annotations.extend(annotate_entity_tokens(entity, count))
+        else:
+            annotations.extend(annotate_entity_tokens(entity, corpus=corpus))
     return annotations
 
 
-def convert_message_lines(task: Task, message: Message) -> str:
-    """Convert message to lines which can be stored in txt in the well-known NER format."""
-    span_generator = WordPunctTokenizer().span_tokenize(message.text)
-    spans = [span for span in span_generator]
+def message_spans(message: 'Message', corpus: Corpus = None) -> List[Tuple]:
+    """Token spans of the message text, using the tokenizer of corpus, which defaults to the corpus of message."""
+    return get_spans(message.text, corpus if corpus else message.data.get('corpus'))
+
+
+def convert_message_tokens(task: Task, message: 'Message', spans: List[Tuple] = None,
+                           corpus: Corpus = None) -> Tuple[List[str], List[str]]:
+    """Lower case tokens of message and their NER annotations, which are all 'O' for Task.INTENT."""
+    corpus = corpus if corpus else message.data.get('corpus')
+    if spans is None:
+        spans = message_spans(message, corpus)
     texts = list(map(lambda t: message.text[t[0]:t[1]].lower(), spans))  # using only lower case
     entities = message.data['entities'] if ('entities' in message.data) else []
 
     if task != Task.INTENT:
-        annotations = annotate_tokens_using_ner(spans, entities)
+        annotations = annotate_tokens_using_ner(spans, entities, message.text, corpus)
     else:
         annotations = ['O'] * len(spans)
 
     # cannot use this assertion thanks to incorrect start index for some sentence in AskUbuntuCorpus
     # Problem upgrading Ubuntu [9.10](UbuntuVersion:Ubuntu 9.10)
     # assert len(texts) == len(annotations)
+    return texts, annotations
+
+
+def convert_message_lines(task: Task, message: 'Message', spans: List[Tuple] = None, corpus: Corpus = None) -> str:
+    """Convert message to lines which can be stored in txt in the well-known NER format.
+
+    Pass spans from message_spans to avoid tokenizing the same message for every task.
+    """
+    texts, annotations = convert_message_tokens(task, message, spans, corpus)
 
     if task != Task.NER:
         # add first line which contains '{} [intent]'.format(intent)
@@ -125,7 +161,7 @@ def convert_message_lines(task: Task, message: Message) -> str:
     return lines
 
 
-def convert_messages_lines(task: Task, messages: Iterable[Message]) -> str:
+def convert_messages_lines(task: Task, messages: Iterable['Message']) -> str:
     """Convert multiple messages to lines which can be stored in well-known NER format."""
     return '\n\n'.join(map(lambda message: convert_message_lines(task, message), messages))
 
@@ -136,32 +172,54 @@ def write(text: str, filename: Path):
         f.write(text)
 
 
-def write_filtered_ner(task: Task, messages: Iterable[Message], filename: Path, training: bool):
+BUFFER_SIZE = 1 << 16  # bytes buffered per output file before hitting the disk
+
+
+def open_output(filename: Path) -> TextIO:
+    """Open filename for buffered utf8 writing."""
+    return open(str(filename), 'w', encoding='utf8', buffering=BUFFER_SIZE)
+
+
+def write_messages_lines(task: Task, messages: Iterable['Message'], f: TextIO):
+    """Streams messages to f one sentence block at a time, same output as convert_messages_lines."""
+    separator = ''
+    for message in messages:
+        f.write(separator)
+        f.write(convert_message_lines(task, message))
+        separator = '\n\n'
+
+
+def write_split_ner(messages: Iterable['Message'], directories: Dict[Task, Path], corpus: Corpus = None):
+    """Streams train and test files for every task in directories in a single pass over messages.
+
+    Each message is tokenized once and the spans are shared by all tasks. The block index of every file is written
+    next to it, see nlu_datasets.blocks.
+    """
+    with ExitStack() as stack:
+        files = {}
+        for task, directory in directories.items():
+            os.makedirs(str(directory), exist_ok=True)
+            files[task] = {True: stack.enter_context(BlockWriter(directory / 'train.txt', BUFFER_SIZE)),
+                           False: stack.enter_context(BlockWriter(directory / 'test.txt', BUFFER_SIZE))}
+        for message in messages:
+            training = message.data['training']
+            spans = message_spans(message, corpus)
+            for task in directories:
+                files[task][training].write(convert_message_lines(task, message, spans, corpus))
+
+
+def write_filtered_ner(task: Task, messages: Iterable['Message'], filename: Path, training: bool):
     """Writes train or test messages to filename."""
     filtered_messages = filter(lambda message: message.data['training'] == training, messages)
-    write(convert_messages_lines(task, filtered_messages), filename)
+    with open_output(filename) as f:
+        write_messages_lines(task, filtered_messages, f)
 
 
 def write_ner(corpus: Corpus, task: Task, directory: Path):
     """Writes complete corpus to train and test files."""
-    os.makedirs(str(directory), exist_ok=True)
-    messages = get_messages(corpus)
-    write_filtered_ner(task, messages, directory / 'train.txt', training=True)
-    write_filtered_ner(task, messages, directory / 'test.txt', training=False)
+    write_split_ner(get_messages(corpus), {task: directory}, corpus)
 
 
 if __name__ == '__main__':
-    for dataset in Corpus:
-        corpus_dir = get_project_root() / 'generated' / dataset.name.lower()
-        for task in Task:
-            task_dir = corpus_dir / task.name.lower()
-            write_ner(dataset, task, task_dir)
-        to_tsv(dataset, corpus_dir / (dataset.name.lower() + '.tsv'))
-
-    '''
-    dataset = Corpus.WEBAPPLICATIONS
-    task = Task.INTENT
-    folder = get_project_root() / 'generated' / dataset.name.lower() / task.name.lower()
-    write_ner(dataset, task, folder)
-    # to_tsv(dataset, folder / (dataset.name.lower() + '.tsv'))
-    '''
+    from nlu_datasets.generate import main
+    main()
@@ -1,41 +1,65 @@
-from typing import Iterable, List
-
-from rasa_nlu.training_data.message import Message
+from typing import Iterable, List, Optional, Tuple, TYPE_CHECKING
 
 import nlu_datasets.utils  # got import error when using from ... import ...
-from nltk.tokenize import WordPunctTokenizer
 from nlu_datasets.my_types import Corpus
+from nlu_datasets.tokenizer import WORD_PUNCT, get_tokenizer
+
+if TYPE_CHECKING:  # rasa_nlu is only imported once messages are built
+    from rasa_nlu.training_data.message import Message
+
+
+SOURCE_TOKENIZER = WORD_PUNCT  # the token indices in the NLU-Evaluation Corpora count WordPunct tokens
+
 
+def get_spans(text: str, corpus: Optional[Corpus] = None) -> List[Tuple[int, int]]:
+    """ Character start and end index of every token in text, using the tokenizer of corpus. """
+    return get_tokenizer(corpus).span_tokenize(text)
 
-def convert_index(text: str, token_index: int, start: bool) -> int:
-    """ Convert token_index as used by NLU-Evaluation Corpora to character index. """
-    span_generator = WordPunctTokenizer().span_tokenize(text)
-    spans = [span for span in span_generator]
+
+def get_source_spans(text: str) -> List[Tuple[int, int]]:
+    """ Spans of the tokens which the start and stop indices of NLU-Evaluation Corpora entities refer to. """
+    return SOURCE_TOKENIZER.span_tokenize(text)
+
+
+def convert_index(text: str, token_index: int, start: bool, spans: List[Tuple[int, int]] = None) -> int:
+    """ Convert token_index as used by NLU-Evaluation Corpora to character index.
+
+    Pass spans from get_source_spans(text) to avoid tokenizing text again for every index.
+    """
+    spans = spans if spans is not None else get_source_spans(text)
     return spans[token_index][0 if start else 1]
 
 
-def convert_nlu_evaluation_entity(text: str, entity: dict) -> dict:
+def convert_nlu_evaluation_entity(text: str, entity: dict, spans: List[Tuple[int, int]] = None) -> dict:
     """ Convert a NLU Evaluation Corpora sentence to Entity object. See test for examples. """
-    start = convert_index(text, entity['start'], start=True)
-    end = convert_index(text, entity['stop'], start=False)
+    spans = spans if spans is not None else get_source_spans(text)
+    start = convert_index(text, entity['start'], start=True, spans=spans)
+    end = convert_index(text, entity['stop'], start=False, spans=spans)
     return nlu_datasets.utils.create_entity(start, end, entity=entity['entity'], value=entity['text'])
 
 
-def build_message(text: str, intent: str, entities: List[dict], training: bool) -> Message:
+def build_message(text: str, intent: str, entities: List[dict], training: bool) -> 'Message':
+    from rasa_nlu.training_data.message import Message
+
     message = Message.build(text, intent, entities)
     message.data['training'] = training
     return message
 
 
-def read_nlu_evaluation_corpora(corpus: Corpus) -> Iterable[Message]:
+def read_nlu_evaluation_corpora(corpus: Corpus) -> Iterable['Message']:
     """Convert NLU Evaluation Corpora dictionary to the internal representation."""
     file = nlu_datasets.utils.get_path(corpus)
-    js = nlu_datasets.utils.convert_json_dict(file)
+    sentences = nlu_datasets.utils.convert_json_dict(file)['sentences']
+    texts = [sentence['text'] for sentence in sentences if sentence['entities']]
+    spans = iter(SOURCE_TOKENIZER.span_tokenize_many(texts))  # shared by all entities of a sentence
 
     def convert_entities(sentence: dict) -> List[dict]:
-        return list(map(lambda e: convert_nlu_evaluation_entity(sentence['text'], e), sentence['entities']))
+        if not sentence['entities']:
+            return []
+        sentence_spans = next(spans)
+        return [convert_nlu_evaluation_entity(sentence['text'], e, sentence_spans) for e in sentence['entities']]
 
-    def convert_sentence(sentence: dict) -> Message:
+    def convert_sentence(sentence: dict) -> 'Message':
         return build_message(sentence['text'], sentence['intent'], convert_entities(sentence), sentence['training'])
 
-    return map(convert_sentence, js['sentences'])
+    return map(convert_sentence, sentences)
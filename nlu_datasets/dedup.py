@@ -0,0 +1,204 @@
+"""Exact and near-duplicate sentences, and duplicates leaking from the training into the test sentences.
+
+Texts are normalized to their lower case word tokens. Exact duplicates have the same normalized text. Near-duplicates
+are found with MinHash over token shingles and locality sensitive hashing: a signature of num_perm minimum hashes is
+split into bands, sentences sharing a band are candidates, and candidates are merged into a group when the Jaccard
+similarity of their shingles is at least threshold. Bands are grouped by sorting, and only sentences in the same
+bucket of a band are compared, every pair of them which is not in the same group yet. The work is n log n for the
+sorting plus the square of the bucket sizes, so the worst case is quadratic for corpora of many near-identical
+sentences, like template-generated ones, which share large buckets. Groups are transitive, a group can contain
+sentences which are only similar to each other through other members.
+
+Run with `python -m nlu_datasets.dedup [corpus ...]` to print the leakage report of every corpus as JSON.
+"""
+import argparse
+import hashlib
+import json
+import re
+import zlib
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Sequence, TYPE_CHECKING
+
+from nlu_datasets.my_types import Corpus
+
+if TYPE_CHECKING:
+    import numpy as np
+    from rasa_nlu.training_data.message import Message
+
+WORD = re.compile(r'\w+')
+DEFAULT_THRESHOLD = 0.7
+SHINGLE_SIZE = 2  # tokens per shingle
+NUM_PERM = 128
+BANDS = 32  # NUM_PERM / BANDS rows per band, candidates are found from a Jaccard similarity of about 0.4
+CHUNK_SIZE = 4096  # sentences hashed at once
+MAX_EXAMPLES = 10
+
+
+def normalize(text: str) -> str:
+    return ' '.join(WORD.findall(text.lower()))
+
+
+@lru_cache(maxsize=1 << 16)
+def get_shingles(normalized: str, size: int = SHINGLE_SIZE) -> FrozenSet[str]:
+    """Token n-grams of a normalized text, a text shorter than size is a single shingle."""
+    tokens = normalized.split(' ')
+    if len(tokens) <= size:
+        return frozenset([normalized])
+    return frozenset(' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def hash_text(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode('utf8'), digest_size=8).digest(), 'little')
+
+
+def group(keys: Iterable[object]) -> List[List[int]]:
+    """Indices having the same key, only groups of more than one index."""
+    groups = {}  # type: Dict[object, List[int]]
+    for i, key in enumerate(keys):
+        groups.setdefault(key, []).append(i)
+    return [indices for indices in groups.values() if len(indices) > 1]
+
+
+def find_exact_duplicates(texts: Sequence[str]) -> List[List[int]]:
+    """Groups of indices of texts having the same normalized text."""
+    return group(hash_text(normalize(text)) for text in texts)
+
+
+class UnionFind:
+    def __init__(self, n: int):
+        self.parents = list(range(n))
+
+    def find(self, i: int) -> int:
+        parents = self.parents
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    def union(self, i: int, j: int):
+        i, j = self.find(i), self.find(j)
+        if i != j:
+            self.parents[max(i, j)] = min(i, j)
+
+    def groups(self) -> List[List[int]]:
+        return group(self.find(i) for i in range(len(self.parents)))
+
+
+def get_band_keys(normalized: Sequence[str], num_perm: int = NUM_PERM, bands: int = BANDS, seed: int = 0,
+                  shingle_size: int = SHINGLE_SIZE) -> 'np.ndarray':
+    """Array [len(normalized), bands] of uint64 keys, one for the minimum hashes of every band of a signature.
+
+    The permutations are multiply-shift hashes of the crc32 of every shingle, computed in uint64 which wraps around.
+    """
+    import numpy as np
+
+    if num_perm % bands:
+        raise ValueError('num_perm {} is not a multiple of bands {}'.format(num_perm, bands))
+    rng = np.random.RandomState(seed)
+    a = rng.randint(0, 1 << 62, size=num_perm, dtype=np.int64).astype(np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.randint(0, 1 << 62, size=num_perm, dtype=np.int64).astype(np.uint64)
+    multipliers = rng.randint(0, 1 << 62, size=num_perm // bands, dtype=np.int64).astype(np.uint64) | np.uint64(1)
+    keys = np.empty((len(normalized), bands), dtype=np.uint64)
+    for start in range(0, len(normalized), CHUNK_SIZE):
+        shingles = [get_shingles(text, shingle_size) for text in normalized[start:start + CHUNK_SIZE]]
+        hashes = np.fromiter((zlib.crc32(s.encode('utf8')) for shingle_set in shingles for s in shingle_set),
+                             dtype=np.uint64)
+        offsets = np.cumsum([0] + [len(shingle_set) for shingle_set in shingles[:-1]])
+        permuted = (hashes[:, None] * a[None, :] + b[None, :]) >> np.uint64(32)
+        signatures = np.minimum.reduceat(permuted, offsets, axis=0).reshape(len(shingles), bands, -1)
+        keys[start:start + len(shingles)] = (signatures * multipliers).sum(axis=2)
+    return keys
+
+
+def find_near_duplicates(texts: Sequence[str], threshold: float = DEFAULT_THRESHOLD, num_perm: int = NUM_PERM,
+                         bands: int = BANDS, seed: int = 0, shingle_size: int = SHINGLE_SIZE) -> List[List[int]]:
+    """Groups of indices of texts which are exact or near-duplicates of each other."""
+    import numpy as np
+
+    normalized = [normalize(text) for text in texts]
+    union_find = UnionFind(len(texts))
+    representatives = {}  # type: Dict[str, int]  # normalized text -> first index having it
+    for i, text in enumerate(normalized):
+        union_find.union(representatives.setdefault(text, i), i)
+    unique = [i for text, i in representatives.items() if text]
+    if len(unique) < 2:
+        return union_find.groups()
+
+    keys = get_band_keys([normalized[i] for i in unique], num_perm, bands, seed, shingle_size)
+    for band in range(bands):
+        order = np.argsort(keys[:, band], kind='stable')
+        sorted_keys = keys[order, band]
+        starts = np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1], [True])))
+        for start, end in zip(starts[:-1], starts[1:]):
+            if end - start < 2:
+                continue
+            seen = []  # texts of the bucket before other
+            for j in order[start:end]:
+                other = unique[j]
+                shingles = get_shingles(normalized[other], shingle_size)
+                for i in seen:  # every pair in the bucket which is not in the same group yet
+                    if union_find.find(i) != union_find.find(other) and \
+                            jaccard(get_shingles(normalized[i], shingle_size), shingles) >= threshold:
+                        union_find.union(i, other)
+                seen.append(other)
+    return union_find.groups()
+
+
+def count_leaks(groups: List[List[int]], training: Sequence[bool]) -> List[int]:
+    """Test sentences in groups which also contain a training sentence."""
+    return sorted(i for indices in groups if any(training[j] for j in indices) for i in indices if not training[i])
+
+
+def leakage_report(texts: Sequence[str], training: Sequence[bool], threshold: float = DEFAULT_THRESHOLD) -> dict:
+    """Duplicates within texts and duplicates of training sentences among the test sentences."""
+    exact = find_exact_duplicates(texts)
+    near = find_near_duplicates(texts, threshold)
+    exact_leaks = count_leaks(exact, training)
+    near_leaks = count_leaks(near, training)
+    return {
+        'sentences': len(texts),
+        'test_sentences': sum(1 for flag in training if not flag),
+        'exact_duplicate_groups': len(exact),
+        'exact_duplicates': sum(len(indices) - 1 for indices in exact),
+        'near_duplicate_groups': len(near),
+        'near_duplicates': sum(len(indices) - 1 for indices in near),
+        'exact_leaks': len(exact_leaks),
+        'near_leaks': len(near_leaks),
+        'threshold': threshold,
+        'examples': [[texts[i] for i in indices] for indices in near if set(indices) & set(near_leaks)][:MAX_EXAMPLES]
+    }
+
+
+def report_messages(messages: Iterable['Message'], threshold: float = DEFAULT_THRESHOLD) -> dict:
+    """leakage_report of messages as returned by utils.get_messages."""
+    messages = list(messages)
+    return leakage_report([m.text for m in messages], [m.data['training'] for m in messages], threshold)
+
+
+def report_corpus(corpus: Corpus, threshold: float = DEFAULT_THRESHOLD) -> dict:
+    """leakage_report of corpus, read from the cached corpus without building messages."""
+    from nlu_datasets.utils import get_corpus
+
+    compact = get_corpus(corpus)
+    report = leakage_report(compact.get_texts(), [compact.is_training(i) for i in range(len(compact))], threshold)
+    return dict(corpus=corpus.name.lower(), **report)
+
+
+def main(args: List[str] = None):
+    from nlu_datasets.generate import parse_corpus
+
+    parser = argparse.ArgumentParser(description='Report duplicates and train / test leakage of corpora.')
+    parser.add_argument('corpora', nargs='*', metavar='corpus', type=parse_corpus, help='defaults to all')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='minimum Jaccard similarity of near-duplicates, default %(default)s')
+    parsed = parser.parse_args(args)
+    reports = [report_corpus(corpus, parsed.threshold) for corpus in (parsed.corpora or tuple(Corpus))]
+    print(json.dumps(reports, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
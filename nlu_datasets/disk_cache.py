@@ -0,0 +1,130 @@
+"""On-disk cache of parsed corpora, shared by all processes on a machine.
+
+Entries are pickled CompactCorpus objects which load much faster than parsing the json sources.
+An entry is keyed by the sha256 of the source files of the corpus and of the modules which read them, so it is
+invalidated automatically when the data or the readers change. The source modification times are only used to avoid
+hashing the same file twice in one process.
+Least recently used entries are evicted once the cache directory grows beyond its size limit.
+
+Configure using the environment:
+    NLU_DATASETS_CACHE_DIR   cache directory, defaults to ~/.cache/nlu_datasets, set to empty to disable the cache
+    NLU_DATASETS_CACHE_SIZE  maximum size of the cache directory in bytes, defaults to 256 MiB
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple, TYPE_CHECKING
+
+from nlu_datasets.compact import CompactCorpus
+from nlu_datasets.manifest import get_name, get_source_files, hash_file
+from nlu_datasets.my_types import Corpus
+from nlu_datasets.tokenizer import get_tokenizer
+
+if TYPE_CHECKING:  # rasa_nlu is only imported once messages are built
+    from rasa_nlu.training_data.message import Message
+
+CACHE_VERSION = 3  # increase when the entry format changes
+READER_MODULES = ['compact', 'corpora', 'json_stream', 'snips', 'tokenizer', 'utils']  # hashed into every key
+DEFAULT_SIZE = 256 * 1024 * 1024
+SUFFIX = '.pickle'
+
+_hashes = {}  # type: Dict[Tuple[str, int, int], str]
+
+
+def get_cache_dir() -> Optional[Path]:
+    """Cache directory or None if caching is disabled."""
+    directory = os.environ.get('NLU_DATASETS_CACHE_DIR', str(Path.home() / '.cache' / 'nlu_datasets'))
+    return Path(directory) if directory else None
+
+
+def get_max_size() -> int:
+    return int(os.environ.get('NLU_DATASETS_CACHE_SIZE', DEFAULT_SIZE))
+
+
+def get_file_hash(file: Path) -> str:
+    """sha256 of file, only computed again when the modification time or size of file changed."""
+    stat = file.stat()
+    key = (str(file), stat.st_mtime_ns, stat.st_size)
+    if key not in _hashes:
+        _hashes[key] = hash_file(file)
+    return _hashes[key]
+
+
+def get_key(corpus: Corpus) -> str:
+    sha = hashlib.sha256('{} {} {}'.format(CACHE_VERSION, corpus.name, get_tokenizer(corpus).name).encode('utf8'))
+    readers = [Path(__file__).parent / (module + '.py') for module in READER_MODULES]
+    for file in readers + get_source_files(corpus):
+        sha.update('\n{} {}'.format(get_name(file), get_file_hash(file)).encode('utf8'))
+    return sha.hexdigest()
+
+
+def get_entry_path(directory: Path, corpus: Corpus, key: str) -> Path:
+    return directory / '{}-{}{}'.format(corpus.name.lower(), key[:16], SUFFIX)
+
+
+def read_entry(path: Path, key: str) -> Optional[CompactCorpus]:
+    """Corpus stored in path or None if there is no valid entry for key."""
+    try:
+        with open(str(path), 'rb') as f:
+            entry_key, compact = pickle.load(f)
+    except Exception:  # a missing, corrupt or incompatible entry is a miss and will be overwritten
+        return None
+    if entry_key != key:
+        return None
+    try:
+        os.utime(str(path))  # marks the entry as recently used
+    except OSError:  # a read-only cache is still used, its entries are just not marked
+        pass
+    return compact
+
+
+def write_entry(path: Path, key: str, compact: CompactCorpus):
+    """Atomically writes compact to path, concurrent readers see either no entry or the complete entry."""
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((key, compact), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, str(path))
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def remove_stale(directory: Path, corpus: Corpus, path: Path):
+    """Removes entries of corpus other than path, these were built from older sources."""
+    for entry in directory.glob('{}-*{}'.format(corpus.name.lower(), SUFFIX)):
+        if entry != path:
+            entry.unlink()
+
+
+def evict(directory: Path, max_size: int):
+    """Removes least recently used entries until the entries in directory take at most max_size bytes."""
+    entries = sorted(((p.stat(), p) for p in directory.glob('*' + SUFFIX)), key=lambda e: e[0].st_mtime)
+    size = sum(stat.st_size for stat, _ in entries)
+    for stat, entry in entries:
+        if size <= max_size:
+            break
+        entry.unlink()
+        size -= stat.st_size
+
+
+def load(corpus: Corpus, reader: Callable[[Corpus], Iterable['Message']]) -> CompactCorpus:
+    """Corpus from the cache, reader is used to parse the corpus when there is no up to date entry."""
+    directory = get_cache_dir()
+    if directory is None:
+        return CompactCorpus.from_messages(reader(corpus))
+    key = get_key(corpus)
+    path = get_entry_path(directory, corpus, key)
+    compact = read_entry(path, key)
+    if compact is None:
+        compact = CompactCorpus.from_messages(reader(corpus))
+        try:
+            os.makedirs(str(directory), exist_ok=True)
+            write_entry(path, key, compact)
+            remove_stale(directory, corpus, path)
+            evict(directory, get_max_size())
+        except OSError:  # a read-only or full disk should not break loading
+            pass
+    return compact
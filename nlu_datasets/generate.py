@@ -0,0 +1,135 @@
+"""Generates the files in generated/ for every corpus, see `python -m nlu_datasets.generate --help`."""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+from nlu_datasets import profiling
+from nlu_datasets.converter import write_split_ner, to_tsv
+from nlu_datasets.manifest import get_stale, update_manifest, DEFAULT_FORMATS
+from nlu_datasets.my_types import Corpus, Task
+from nlu_datasets.utils import get_project_root, get_messages
+
+Job = Tuple[str, Corpus, Path]  # (output format, corpus, output directory)
+
+
+def get_output_dir() -> Path:
+    return get_project_root() / 'generated'
+
+
+def get_corpus_dir(corpus: Corpus, root: Path) -> Path:
+    return root / corpus.name.lower()
+
+
+def write_corpus_ner(corpus: Corpus, corpus_dir: Path):
+    """Writes train and test files for all tasks, tokenizing each message of the corpus only once."""
+    directories = {task: corpus_dir / task.name.lower() for task in Task}
+    write_split_ner(get_messages(corpus), directories, corpus)
+
+
+def write_corpus_tsv(corpus: Corpus, corpus_dir: Path):
+    os.makedirs(str(corpus_dir), exist_ok=True)
+    to_tsv(corpus, corpus_dir / (corpus.name.lower() + '.tsv'))
+
+
+def write_corpus_parquet(corpus: Corpus, corpus_dir: Path):
+    from nlu_datasets.columnar import to_parquet
+
+    os.makedirs(str(corpus_dir), exist_ok=True)
+    to_parquet(corpus, corpus_dir / (corpus.name.lower() + '.parquet'))
+
+
+writers = {
+    'ner': write_corpus_ner,
+    'tsv': write_corpus_tsv,
+    'parquet': write_corpus_parquet
+}
+
+
+def run_job(job: Job):
+    output_format, corpus, corpus_dir = job
+    with profiling.scope(corpus):
+        writers[output_format](corpus, corpus_dir)
+
+
+def get_jobs(corpora: Iterable[Corpus], root: Path, formats: Iterable[str] = DEFAULT_FORMATS) -> List[Job]:
+    return [(output_format, corpus, get_corpus_dir(corpus, root)) for corpus in corpora for output_format in formats]
+
+
+def generate(corpora: Iterable[Corpus] = tuple(Corpus), root: Path = None, workers: int = None,
+             force: bool = False, formats: Iterable[str] = DEFAULT_FORMATS) -> List[Corpus]:
+    """Generate formats for corpora below root using a pool of worker processes.
+
+    Only corpora whose sources changed according to the manifest in root are generated, unless force is set.
+    workers defaults to the number of CPUs, workers=1 runs every job serially in this process.
+    Returns the generated corpora.
+    """
+    root = root if root else get_output_dir()
+    corpora = list(corpora) if force else get_stale(corpora, root, formats)
+    if not corpora:
+        return corpora
+    jobs = get_jobs(corpora, root, formats)
+    workers = workers if workers else os.cpu_count()
+    if workers == 1:
+        for job in jobs:
+            run_job(job)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            list(executor.map(run_job, jobs))  # list() to raise exceptions from the workers
+    update_manifest(corpora, root, formats)
+    return corpora
+
+
+def parse_corpus(name: str) -> Corpus:
+    try:
+        return Corpus[name.upper()]
+    except KeyError:
+        raise argparse.ArgumentTypeError('unknown corpus {}, choose from {}'.format(
+            name, ', '.join(c.name.lower() for c in Corpus)))
+
+
+def parse_args(args: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Generate NER and TSV files from the corpora in data/.')
+    parser.add_argument('corpora', nargs='*', metavar='corpus', type=parse_corpus,
+                        help='corpora to generate, defaults to all')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='number of worker processes')
+    parser.add_argument('-o', '--output', type=Path, default=None, help='output directory, defaults to generated/')
+    parser.add_argument('-f', '--force', action='store_true', help='regenerate corpora which are up to date')
+    parser.add_argument('--format', dest='formats', action='append', choices=sorted(writers),
+                        help='output format, can be repeated, defaults to {}'.format(' and '.join(DEFAULT_FORMATS)))
+    parser.add_argument('--profile', type=Path, default=None, metavar='REPORT',
+                        help='write timings per corpus, task and stage as JSON to REPORT, implies -j 1')
+    parser.add_argument('--cprofile', type=Path, default=None, metavar='DUMP',
+                        help='write a cProfile dump of the run to DUMP, implies -j 1')
+    parser.add_argument('--check', action='store_true',
+                        help='only check whether the output is up to date and unchanged, exits with 1 if it is not')
+    return parser.parse_args(args)
+
+
+def main(args: List[str] = None):
+    parsed = parse_args(args)
+    corpora = parsed.corpora if parsed.corpora else tuple(Corpus)
+    formats = parsed.formats if parsed.formats else DEFAULT_FORMATS
+    if parsed.check:
+        stale = get_stale(corpora, parsed.output if parsed.output else get_output_dir(), formats, verify=True)
+        for corpus in stale:
+            print('{} is out of date'.format(corpus.name.lower()))
+        sys.exit(1 if stale else 0)
+    if not (parsed.profile or parsed.cprofile):
+        generate(corpora, parsed.output, parsed.workers, parsed.force, formats)
+        return
+    profiling.enable(memory=parsed.profile is not None, profile=parsed.cprofile is not None)
+    try:
+        generate(corpora, parsed.output, 1, parsed.force, formats)  # statistics are only kept in this process
+    finally:
+        profiling.disable()
+    if parsed.profile:
+        profiling.write_report(parsed.profile)
+    if parsed.cprofile:
+        profiling.write_profile(parsed.cprofile)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Inverted index over a CompactCorpus for looking up sentences by intent, entity type and training flag."""
+from array import array
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from nlu_datasets.compact import CompactCorpus
+
+Span = Tuple[int, int, int]  # (sentence id, start, end)
+
+
+class CorpusIndex:
+    """Sorted sentence ids per intent, per entity type and per training flag, built in one pass over the arrays."""
+
+    def __init__(self, compact: 'CompactCorpus'):
+        self.compact = compact
+        intent_ids = [array('i') for _ in compact.intents]
+        for i, code in enumerate(compact.intent_codes):
+            intent_ids[code].append(i)
+        self.intent_ids = dict(zip(compact.intents, intent_ids))  # type: Dict[str, array]
+
+        entity_rows = [array('i') for _ in compact.entity_types]  # rows into the entity arrays of compact
+        entity_ids = [array('i') for _ in compact.entity_types]
+        offsets = compact.entity_offsets
+        for i in range(len(compact)):
+            for j in range(offsets[i], offsets[i + 1]):
+                code = compact.entity_type_codes[j]
+                entity_rows[code].append(j)
+                if not entity_ids[code] or entity_ids[code][-1] != i:
+                    entity_ids[code].append(i)
+        self.entity_rows = dict(zip(compact.entity_types, entity_rows))  # type: Dict[str, array]
+        self.entity_ids = dict(zip(compact.entity_types, entity_ids))  # type: Dict[str, array]
+        self.entity_sentences = array('i', (i for i in range(len(compact))
+                                            for _ in range(offsets[i], offsets[i + 1])))
+
+        self.training_ids = {True: array('i'), False: array('i')}  # type: Dict[bool, array]
+        for i, training in enumerate(compact.training):
+            self.training_ids[bool(training)].append(i)
+        self.sets = {}  # type: Dict[tuple, frozenset]  # sets of ids used by query, built on first use
+
+    def get_intent_ids(self, intent: str) -> array:
+        return self.intent_ids.get(intent, array('i'))
+
+    def get_entity_ids(self, entity: str) -> array:
+        """Ids of the sentences containing at least one entity of type entity."""
+        return self.entity_ids.get(entity, array('i'))
+
+    def get_training_ids(self, training: bool) -> array:
+        return self.training_ids[training]
+
+    def get_entity_spans(self, entity: str) -> List[Span]:
+        """(sentence id, start, end) of every entity of type entity."""
+        compact = self.compact
+        rows = self.entity_rows.get(entity, ())
+        return [(self.entity_sentences[j], compact.entity_starts[j], compact.entity_ends[j]) for j in rows]
+
+    def query(self, intent: Optional[str] = None, entity: Optional[str] = None,
+              training: Optional[bool] = None) -> List[int]:
+        """Sorted ids of the sentences matching all given conditions, all sentences when none are given."""
+        candidates = []
+        if intent is not None:
+            candidates.append(('intent', intent, self.get_intent_ids(intent)))
+        if entity is not None:
+            candidates.append(('entity', entity, self.get_entity_ids(entity)))
+        if training is not None:
+            candidates.append(('training', training, self.get_training_ids(training)))
+        if not candidates:
+            return list(range(len(self.compact)))
+        candidates.sort(key=lambda candidate: len(candidate[2]))
+        result = candidates[0][2]
+        for kind, key, ids in candidates[1:]:
+            other = self.get_set(kind, key, ids)
+            result = [i for i in result if i in other]
+        return list(result)
+
+    def get_set(self, kind: str, key, ids: array) -> frozenset:
+        if (kind, key) not in self.sets:
+            self.sets[(kind, key)] = frozenset(ids)
+        return self.sets[(kind, key)]
@@ -0,0 +1,89 @@
+"""Incremental json reader which yields the items of a top-level array while the file is being read.
+
+Only one item and one chunk of the file are held in memory at a time, so the memory needed to read a file does not
+depend on its size. Items are decoded by the C accelerated json decoder.
+"""
+import json
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+WHITESPACE = ' \t\n\r'
+
+
+class JsonStream:
+    """Reads json values from f one at a time, refilling the buffer whenever a value is not complete yet."""
+
+    def __init__(self, f: TextIO, chunk_size: int = 1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0  # position of the next unread character in buffer
+        self.offset = 0  # position of buffer in the file, for error messages
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self) -> bool:
+        """Reads the next chunk into the buffer, returns False at the end of the file."""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        self.eof = not chunk
+        return not self.eof
+
+    def peek(self) -> str:
+        """Next character which is not whitespace, '' at the end of the file."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self.fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, characters: str) -> str:
+        """Consumes and returns the next character, which should be one of characters."""
+        c = self.peek()
+        if not c or c not in characters:
+            raise ValueError('Expecting one of {!r} at character {}'.format(characters, self.offset + self.pos))
+        self.pos += 1
+        return c
+
+    def value(self) -> Any:
+        """Decodes the next complete json value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            if end == len(self.buffer) and self.fill():
+                continue  # a number at the end of the buffer might continue in the next chunk
+            self.pos = end
+            return value
+
+
+def iter_array(file: Path, key: str, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yields the items of the array stored under key in the top-level object of the json file."""
+    # surrogatepass like json.load, the SNIPS _full files contain utf8 encoded surrogate pairs
+    with open(str(file), 'r', encoding='utf8', errors='surrogatepass') as f:
+        stream = JsonStream(f, chunk_size)
+        stream.expect('{')
+        if stream.peek() == '}':
+            raise KeyError(key)
+        while True:
+            name = stream.value()
+            stream.expect(':')
+            if name == key:
+                stream.expect('[')
+                if stream.peek() == ']':
+                    return
+                while True:
+                    yield stream.value()
+                    if stream.expect(',]') == ']':
+                        return
+            stream.value()  # skips the value of other keys
+            if stream.expect(',}') == '}':
+                raise KeyError(key)
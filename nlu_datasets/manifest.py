@@ -0,0 +1,127 @@
+"""Build manifest which records what the files in generated/ were generated from.
+
+The manifest stores, per corpus, the converter version, the name of the tokenizer, a hash of every source file, the
+formats which were generated from these sources and a hash of every output file. A corpus only needs to be regenerated
+when its entry differs from the current sources, when a format was not generated from them or when one of its outputs
+is missing. `generate --check` also verifies that the outputs were not changed after they were generated.
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from nlu_datasets.my_types import Corpus, Task
+from nlu_datasets.tokenizer import get_tokenizer
+from nlu_datasets.utils import get_path, get_project_root
+
+CONVERTER_VERSION = 3  # increase when a change to the converters changes the generated files
+MANIFEST_NAME = 'manifest.json'
+DEFAULT_FORMATS = ('ner', 'tsv')  # parquet requires pyarrow and is only generated on request
+
+
+def get_source_files(corpus: Corpus) -> List[Path]:
+    """Files which are read to build the messages of corpus."""
+    from nlu_datasets.snips import get_folders, get_filename
+
+    if corpus == Corpus.MOCK:
+        return [get_project_root() / 'nlu_datasets' / 'mock.py']
+    if corpus in [Corpus.SNIPS2017, Corpus.SNIPS2017_FULL]:
+        return [folder / get_filename(corpus, folder.name, train) for folder in get_folders(corpus)
+                for train in [True, False]]
+    return [get_path(corpus)]
+
+
+def get_name(file: Path) -> str:
+    """Path of file relative to the project root, or absolute for sources outside of it."""
+    try:
+        return file.relative_to(get_project_root()).as_posix()
+    except ValueError:
+        return file.as_posix()
+
+
+def hash_file(file: Path) -> str:
+    sha = hashlib.sha256()
+    with open(str(file), 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def build_entry(corpus: Corpus) -> dict:
+    """Manifest entry describing the current sources of corpus, without the outputs."""
+    sources = {get_name(file): hash_file(file) for file in get_source_files(corpus)}
+    return {'version': CONVERTER_VERSION, 'tokenizer': get_tokenizer(corpus).name, 'sources': sources}
+
+
+def get_output_files(corpus: Corpus, corpus_dir: Path, formats: Iterable[str] = DEFAULT_FORMATS) -> List[Path]:
+    """Files generated for corpus in formats."""
+    name = corpus.name.lower()
+    outputs = {
+        'ner': [corpus_dir / task.name.lower() / filename for task in Task
+                for filename in ['train.txt', 'train.txt.idx', 'test.txt', 'test.txt.idx']],
+        'tsv': [corpus_dir / (name + '.tsv')],
+        'parquet': [corpus_dir / (name + '.parquet')]
+    }
+    return [file for output_format in formats for file in outputs[output_format]]
+
+
+def read_manifest(root: Path) -> Dict[str, dict]:
+    path = root / MANIFEST_NAME
+    if not path.is_file():
+        return {}
+    with open(str(path), 'r', encoding='utf8') as f:
+        return json.load(f)
+
+
+def write_manifest(root: Path, manifest: Dict[str, dict]):
+    with open(str(root / MANIFEST_NAME), 'w', encoding='utf8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def get_sources(entry: dict) -> dict:
+    """entry without the formats and outputs, to be compared with build_entry."""
+    return {key: value for key, value in entry.items() if key not in ['formats', 'outputs']}
+
+
+def hash_outputs(files: Iterable[Path], root: Path) -> Dict[str, str]:
+    return {file.relative_to(root).as_posix(): hash_file(file) for file in files}
+
+
+def is_up_to_date(corpus: Corpus, root: Path, manifest: Dict[str, dict],
+                  formats: Iterable[str] = DEFAULT_FORMATS, verify: bool = False) -> bool:
+    """verify also compares the outputs with the hashes recorded when they were generated."""
+    name = corpus.name.lower()
+    entry = manifest.get(name, {})
+    outputs = get_output_files(corpus, root / name, formats)
+    if get_sources(entry) != build_entry(corpus) or not set(formats) <= set(entry.get('formats', [])) or \
+            not all(map(lambda p: p.is_file(), outputs)):
+        return False
+    recorded = entry.get('outputs', {})
+    return not verify or all(recorded.get(path) == sha for path, sha in hash_outputs(outputs, root).items())
+
+
+def get_stale(corpora: Iterable[Corpus], root: Path, formats: Iterable[str] = DEFAULT_FORMATS,
+              verify: bool = False) -> List[Corpus]:
+    """Corpora for which the files in formats below root are missing or out of date, or changed if verify is set."""
+    manifest = read_manifest(root)
+    return [corpus for corpus in corpora if not is_up_to_date(corpus, root, manifest, formats, verify)]
+
+
+def update_manifest(corpora: Iterable[Corpus], root: Path, formats: Iterable[str] = DEFAULT_FORMATS):
+    """Record the current sources and the outputs in formats of corpora, to be called after they have been generated.
+
+    Formats which were generated before from the same sources stay recorded.
+    """
+    manifest = read_manifest(root)
+    for corpus in corpora:
+        name = corpus.name.lower()
+        entry = build_entry(corpus)
+        previous = manifest.get(name, {})
+        generated, outputs = set(formats), {}
+        if get_sources(previous) == entry:
+            generated.update(previous.get('formats', []))
+            outputs.update(previous.get('outputs', {}))
+        outputs.update(hash_outputs(get_output_files(corpus, root / name, formats), root))
+        manifest[name] = dict(entry, formats=sorted(generated), outputs=outputs)
+    write_manifest(root, manifest)
@@ -0,0 +1,62 @@
+"""Renders messages as Rasa NLU Markdown training examples without building a TrainingData per message."""
+from typing import Iterable, List, TYPE_CHECKING
+
+if TYPE_CHECKING:  # rasa_nlu is only imported once messages are built
+    from rasa_nlu.training_data.message import Message
+    from nlu_datasets.compact import CompactCorpus
+
+
+def annotate_entity(text: str, entity: dict) -> str:
+    """Returns [text](entity) or [text](entity:value) when the text differs from the entity value."""
+    entity_text = text[entity['start']:entity['end']]
+    entity_type = entity['entity']
+    if entity_text != entity['value']:
+        entity_type += ':' + entity['value']  # synonym suffix
+    return '[{}]({})'.format(entity_text, entity_type)
+
+
+def annotate(text: str, entities: Iterable[dict]) -> str:
+    """Text having annotated entities, same output as rasa_nlu's MarkdownWriter for a single example."""
+    parts = []
+    pos = 0
+    for entity in sorted(entities, key=lambda e: e['start']):
+        parts.append(text[pos:entity['start']])
+        parts.append(annotate_entity(text, entity))
+        pos = entity['end']
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
+def annotate_message(message: 'Message') -> str:
+    return annotate(message.text, message.data.get('entities', []))
+
+
+def annotate_messages(messages: Iterable['Message']) -> List[str]:
+    """Annotated strings for a batch of messages, for example a complete corpus."""
+    return [annotate(message.text, message.data.get('entities', [])) for message in messages]
+
+
+def annotate_corpus(compact: 'CompactCorpus') -> List[str]:
+    """Annotated strings for all sentences of compact, read directly from its arrays."""
+    annotated = []
+    starts, ends, values, types = compact.entity_starts, compact.entity_ends, compact.values, compact.entity_types
+    for i, text in enumerate(compact.get_texts()):
+        rows = sorted(range(compact.entity_offsets[i], compact.entity_offsets[i + 1]), key=starts.__getitem__)
+        parts = []
+        pos = 0
+        for j in rows:
+            entity_text = text[starts[j]:ends[j]]
+            entity_type = types[compact.entity_type_codes[j]]
+            value = values[compact.value_offsets[j]:compact.value_offsets[j + 1]]
+            if entity_text != value:
+                entity_type += ':' + value
+            parts.append('{}[{}]({})'.format(text[pos:starts[j]], entity_text, entity_type))
+            pos = ends[j]
+        parts.append(text[pos:])
+        annotated.append(''.join(parts))
+    return annotated
+
+
+def remove_brackets(text: str) -> str:
+    """Removes the characters which have a meaning in the Markdown format."""
+    return text.replace('(', '').replace(')', '').replace('[', '').replace(']', '')
@@ -0,0 +1,128 @@
+"""In-memory cache of loaded corpora, shared by all threads of a process.
+
+Entries are evicted least recently used first once their total size exceeds the memory budget. Sizes are taken from
+CompactCorpus.nbytes when an entry is stored, an inverted index built later is not accounted for. A corpus larger than
+the whole budget is returned but not kept. Concurrent calls for a corpus which is not cached share a single load, a
+failed load is raised in every waiting thread and is not cached.
+
+Configure using the environment:
+    NLU_DATASETS_MEMORY_SIZE  memory budget of the cache in bytes, defaults to 512 MiB
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, NamedTuple, Optional, Tuple, TYPE_CHECKING
+
+from nlu_datasets.my_types import Corpus
+
+if TYPE_CHECKING:
+    from nlu_datasets.compact import CompactCorpus
+
+DEFAULT_SIZE = 512 * 1024 * 1024
+
+
+def get_max_size() -> int:
+    return int(os.environ.get('NLU_DATASETS_MEMORY_SIZE', DEFAULT_SIZE))
+
+
+class CacheStats(NamedTuple):
+    hits: int  # calls served from the cache, including calls which joined a load in flight
+    misses: int  # calls which started a load
+    evictions: int
+    load_seconds: float  # total time spent in loads
+    entries: int
+    size: int  # bytes of the cached entries
+    max_size: int
+
+
+class CorpusCache:
+    """Corpora returned by loader, kept within max_size bytes, which defaults to get_max_size() when None."""
+
+    def __init__(self, loader: Callable[[Corpus], 'CompactCorpus'], max_size: Optional[int] = None):
+        self.loader = loader
+        self.max_size = max_size
+        self._entries = OrderedDict()  # type: OrderedDict[Corpus, Tuple[CompactCorpus, int]]  # least recent first
+        self._loads = {}  # type: Dict[Corpus, Future]  # loads in flight
+        self._lock = threading.Lock()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._load_seconds = 0.0
+
+    def get_max_size(self) -> int:
+        return get_max_size() if self.max_size is None else self.max_size
+
+    def get(self, corpus: Corpus) -> 'CompactCorpus':
+        """Cached corpus, loaded once by the first caller while the others wait for it."""
+        with self._lock:
+            if corpus in self._entries:
+                self._entries.move_to_end(corpus)
+                self._hits += 1
+                return self._entries[corpus][0]
+            future = self._loads.get(corpus)
+            loading = future is None
+            if loading:
+                future = self._loads[corpus] = Future()
+                self._misses += 1
+            else:
+                self._hits += 1
+        if not loading:
+            return future.result()
+
+        start = time.perf_counter()
+        try:
+            compact = self.loader(corpus)
+        except BaseException as e:
+            with self._lock:
+                self._load_seconds += time.perf_counter() - start
+                if self._loads.get(corpus) is future:
+                    del self._loads[corpus]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._load_seconds += time.perf_counter() - start
+            if self._loads.get(corpus) is future:  # not invalidated while loading
+                del self._loads[corpus]
+                self._store(corpus, compact)
+        future.set_result(compact)
+        return compact
+
+    def _store(self, corpus: Corpus, compact: 'CompactCorpus'):
+        size = compact.nbytes()
+        max_size = self.get_max_size()
+        if size > max_size:
+            return
+        self._entries[corpus] = (compact, size)
+        self._size += size
+        while self._size > max_size:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._size -= evicted
+            self._evictions += 1
+
+    def invalidate(self, corpus: Corpus) -> bool:
+        """Removes corpus, a load in flight is still returned to its callers but not cached. True if it was cached."""
+        with self._lock:
+            self._loads.pop(corpus, None)
+            entry = self._entries.pop(corpus, None)
+            if entry is not None:
+                self._size -= entry[1]
+            return entry is not None
+
+    def clear(self):
+        """Removes all corpora, the statistics are kept."""
+        with self._lock:
+            self._loads.clear()
+            self._entries.clear()
+            self._size = 0
+
+    def __contains__(self, corpus: Corpus) -> bool:
+        with self._lock:
+            return corpus in self._entries
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, self._load_seconds, len(self._entries),
+                              self._size, self.get_max_size())
@@ -0,0 +1,20 @@
+"""Corpus.MOCK, twenty sentences '0' to '19' used by the tests, built without rasa_nlu."""
+from typing import Iterable, Iterator, Tuple, TYPE_CHECKING
+
+from nlu_datasets.my_types import Corpus
+
+if TYPE_CHECKING:  # rasa_nlu is only imported once messages are built
+    from rasa_nlu.training_data.message import Message
+
+
+def get_mock_records(corpus: Corpus = Corpus.MOCK) -> Iterator[Tuple[str, dict]]:
+    """(text, data) like Message.text and Message.data of get_mock_messages, see CompactCorpus.from_records."""
+    for x in range(20):
+        yield str(x), {'intent': 'A' if x < 10 else 'B', 'entities': [], 'training': x < 15, 'corpus': corpus}
+
+
+def get_mock_messages(corpus: Corpus = Corpus.MOCK) -> Iterable['Message']:
+    from nlu_datasets.utils import create_message
+
+    return (create_message(text, data['intent'], data['entities'], data['training'], corpus)
+            for text, data in get_mock_records(corpus))
@@ -8,6 +8,7 @@ class Corpus(Enum):
     CHATBOT = auto()
     WEBAPPLICATIONS = auto()
     SNIPS2017 = auto()
+    SNIPS2017_FULL = auto()  # SNIPS2017 using the larger train_<intent>_full.json files for training
 
 
 class Task(Enum):
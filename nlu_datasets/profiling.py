@@ -0,0 +1,217 @@
+"""Opt-in instrumentation of the conversion pipeline.
+
+enable() wraps the functions in TARGETS, in their own module and in every nlu_datasets module which imported them by
+name, and disable() restores the originals. Nothing is wrapped while profiling is disabled, so it costs nothing then.
+Every call of a wrapped function adds its time, the sentences and the bytes it handled to the statistics of its stage,
+the current corpus and the task. The corpus comes from the innermost scope(), the task from the scope or from the
+arguments of the call. Times are inclusive: writing a TSV file includes annotating its sentences.
+With memory tracing, the peak memory is recorded per corpus and task, the task None covers a whole scope. The NER files
+of all tasks are written in one sweep, so the peak of a task only covers the calls attributed to it.
+
+Corpora cached on disk are not parsed again, run with NLU_DATASETS_CACHE_DIR='' to include parsing in the report.
+`python -m nlu_datasets.generate --profile report.json --cprofile run.prof` profiles a generation run, the cProfile
+dump can be viewed with snakeviz or turned into a flamegraph with flameprof.
+"""
+import cProfile
+import importlib
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from nlu_datasets.my_types import Corpus, Task
+
+Count = Callable[[tuple, object], Tuple[int, int]]  # (arguments, result) -> (sentences, bytes)
+
+
+def count_one(args: tuple, result: object) -> Tuple[int, int]:
+    return 1, 0
+
+
+def count_text(args: tuple, result: object) -> Tuple[int, int]:
+    """One sentence, given as the last positional argument."""
+    return 1, len(args[-1].encode('utf8'))
+
+
+def count_texts(args: tuple, result: object) -> Tuple[int, int]:
+    return len(args[-1]), sum(len(text.encode('utf8')) for text in args[-1])
+
+
+def count_json(args: tuple, result: object) -> Tuple[int, int]:
+    return len(result.get('sentences', [])), Path(args[0]).stat().st_size
+
+
+def count_written(position: int) -> Count:
+    """Counts one text written, given as the positional argument at position."""
+    def count(args: tuple, result: object) -> Tuple[int, int]:
+        return 1, len(args[position].encode('utf8'))
+
+    return count
+
+
+def count_file(args: tuple, result: object) -> Tuple[int, int]:
+    """Size of the file written, given as the last argument."""
+    return 0, Path(args[-1]).stat().st_size
+
+
+TARGETS = [  # (module, function or Class.method, stage, count)
+    ('nlu_datasets.utils', 'convert_json_dict', 'parse', count_json),
+    ('nlu_datasets.snips', 'convert_data_message', 'parse', count_one),
+    ('nlu_datasets.tokenizer', 'RegexTokenizer.span_tokenize', 'tokenize', count_text),
+    ('nlu_datasets.tokenizer', 'RegexTokenizer.span_tokenize_many', 'tokenize', count_texts),
+    ('nlu_datasets.corpora', 'convert_index', 'tokenize', count_one),
+    ('nlu_datasets.markdown', 'annotate', 'markdown', count_one),
+    ('nlu_datasets.converter', 'convert_message_lines', 'ner', count_one),
+    ('nlu_datasets.blocks', 'BlockWriter.write', 'write', count_written(1)),  # (self, text)
+    ('nlu_datasets.converter', 'write', 'write', count_written(0)),  # (text, filename)
+    ('nlu_datasets.converter', 'write_tsv', 'write', count_file),
+]
+
+Key = Tuple[Optional[str], Optional[str], str, str]  # (corpus, task, stage, function)
+
+_stats = {}  # type: Dict[Key, List[float]]  # key -> [calls, seconds, sentences, bytes]
+Scope = Tuple[Optional[str], Optional[str]]  # (corpus, task)
+
+_peaks = {}  # type: Dict[Scope, int]  # (corpus, task) -> peak bytes allocated within its scopes and calls
+_scopes = []  # type: List[Scope]  # innermost last
+_patched = []  # type: List[Tuple[object, str, object]]  # (namespace, attribute, original) to restore
+_profiler = None  # type: Optional[cProfile.Profile]
+
+
+def is_enabled() -> bool:
+    return bool(_patched)
+
+
+def get_task(args: tuple) -> Optional[str]:
+    for arg in args[:2]:  # the task is the first argument of the functions in TARGETS taking one
+        if isinstance(arg, Task):
+            return arg.name.lower()
+    return _scopes[-1][1] if _scopes else None
+
+
+def record_peak():
+    """Adds the peak since the last call to the peaks of all open scopes and starts measuring the next peak."""
+    if not tracemalloc.is_tracing():
+        return
+    peak = tracemalloc.get_traced_memory()[1]
+    for key in set(_scopes):
+        if key[0] is not None:
+            _peaks[key] = max(_peaks.get(key, 0), peak)
+    if hasattr(tracemalloc, 'reset_peak'):  # Python 3.9
+        tracemalloc.reset_peak()
+
+
+def instrument(function: Callable, stage: str, name: str, count: Count) -> Callable:
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        current = _scopes[-1] if _scopes else (None, None)
+        corpus, task = current[0], get_task(args)
+        traced = tracemalloc.is_tracing() and task is not None and (corpus, task) != current
+        if traced:
+            record_peak()
+            _scopes.append((corpus, task))
+        start = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            if traced:
+                record_peak()
+                _scopes.pop()
+        seconds = time.perf_counter() - start
+        stats = _stats.setdefault((corpus, task, stage, name), [0, 0.0, 0, 0])
+        sentences, n_bytes = count(args, result)
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] += sentences
+        stats[3] += n_bytes
+        return result
+
+    return wrapper
+
+
+def patch(namespace: object, attribute: str, replacement: object):
+    _patched.append((namespace, attribute, getattr(namespace, attribute)))
+    setattr(namespace, attribute, replacement)
+
+
+def enable(memory: bool = False, profile: bool = False):
+    """Start recording statistics, memory enables tracemalloc and profile a cProfile.Profile of everything."""
+    global _profiler
+    if is_enabled():
+        return
+    for module_name, qualname, stage, count in TARGETS:
+        module = importlib.import_module(module_name)
+        if '.' in qualname:
+            class_name, method = qualname.split('.')
+            cls = getattr(module, class_name)
+            patch(cls, method, instrument(getattr(cls, method), stage, qualname, count))
+            continue
+        original = getattr(module, qualname)
+        wrapper = instrument(original, stage, qualname, count)
+        for name, loaded in list(sys.modules.items()):
+            if name.startswith('nlu_datasets') and getattr(loaded, qualname, None) is original:
+                patch(loaded, qualname, wrapper)
+    if memory:
+        tracemalloc.start()
+    if profile:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+def disable():
+    """Stop recording and restore the original functions, the statistics are kept until reset()."""
+    global _profiler
+    while _patched:
+        namespace, attribute, original = _patched.pop()
+        setattr(namespace, attribute, original)
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    if _profiler is not None:
+        _profiler.disable()
+
+
+def reset():
+    _stats.clear()
+    _peaks.clear()
+
+
+@contextmanager
+def scope(corpus: Optional[Corpus], task: Optional[Task] = None):
+    """Attributes the calls within to corpus and task, and records their peak memory when memory is traced."""
+    if not is_enabled():
+        yield
+        return
+    record_peak()
+    _scopes.append((corpus.name.lower() if corpus is not None else None, task.name.lower() if task else None))
+    try:
+        yield
+    finally:
+        record_peak()
+        _scopes.pop()
+
+
+def get_report() -> dict:
+    stages = [{'corpus': corpus, 'task': task, 'stage': stage, 'function': function, 'calls': int(calls),
+               'seconds': seconds, 'sentences': int(sentences), 'bytes': int(n_bytes)}
+              for (corpus, task, stage, function), (calls, seconds, sentences, n_bytes) in _stats.items()]
+    stages.sort(key=lambda s: (s['corpus'] or '', s['task'] or '', s['stage'], s['function']))
+    peaks = [{'corpus': corpus, 'task': task, 'bytes': n_bytes} for (corpus, task), n_bytes in _peaks.items()]
+    peaks.sort(key=lambda p: (p['corpus'], p['task'] or ''))
+    return {'stages': stages, 'peak_bytes': peaks}
+
+
+def write_report(filename: Path):
+    with open(str(filename), 'w', encoding='utf8') as f:
+        json.dump(get_report(), f, indent=2)
+        f.write('\n')
+
+
+def write_profile(filename: Path):
+    """Dumps the cProfile statistics in the pstats format."""
+    if _profiler is None:
+        raise ValueError('profiling was not enabled with profile=True')
+    _profiler.dump_stats(str(filename))
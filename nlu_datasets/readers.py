@@ -0,0 +1,173 @@
+"""Reads the generated TSV and NER files back into the corpus model, without rasa_nlu or the sources in data/.
+
+Both readers stream their file and yield (text, data) records like Message.text and Message.data, which
+CompactCorpus.from_records stores in compact form. Entities get character offsets into the rebuilt text.
+
+The NER files only keep lower case tokens, so their text is rebuilt by joining the tokens with a space. It is not the
+original sentence, but it tokenizes into the same tokens and converts back into the same lines.
+The check_* functions compare a generated file with the corpus it was generated from.
+"""
+import csv
+import re
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from nlu_datasets.compact import CompactCorpus
+from nlu_datasets.markdown import remove_brackets
+from nlu_datasets.my_types import Corpus, Task
+from nlu_datasets.utils import create_entity
+
+Record = Tuple[str, dict]  # (text, data) like Message.text and Message.data
+
+# the pattern of rasa_nlu.training_data.formats.markdown for [text](entity) and [text](entity:value)
+ANNOTATION = re.compile(r'\[(?P<text>[^\]]+)\]\((?P<entity>[^:)]*?)(?::(?P<value>[^)]+))?\)')
+SEPARATOR = '\n\n'
+CHUNK_SIZE = 1 << 16  # characters read at once from NER files
+
+
+def parse_annotated(annotated: str) -> Tuple[str, List[dict]]:
+    """Text and entities of a sentence in Rasa Markdown, the inverse of markdown.annotate."""
+    parts = []
+    entities = []
+    length = 0
+    position = 0
+    for match in ANNOTATION.finditer(annotated):
+        before = annotated[position:match.start()]
+        parts.append(before)
+        start = length + len(before)
+        text = match.group('text')
+        parts.append(text)
+        length = start + len(text)
+        value = match.group('value') if match.group('value') else text
+        entities.append(create_entity(start, length, match.group('entity'), value))
+        position = match.end()
+    parts.append(annotated[position:])
+    return ''.join(parts), entities
+
+
+def build_data(intent: Optional[str], entities: List[dict], training: Optional[bool]) -> dict:
+    """data having the keys of CompactCorpus.get_data, which only contains intent and entities when they are set."""
+    data = {}
+    if intent:
+        data['intent'] = intent
+    if entities:
+        data['entities'] = entities
+    if training is not None:
+        data['training'] = training
+    return data
+
+
+def iter_tsv(filename: Path) -> Iterator[Record]:
+    """Streams the sentences of a file written by converter.write_tsv."""
+    with open(str(filename), 'r', encoding='utf8', newline='') as f:
+        rows = csv.reader(f, delimiter='\t')
+        header = next(rows)
+        has_training = len(header) == 3
+        for row in rows:
+            text, entities = parse_annotated(row[0])
+            yield text, build_data(row[1], entities, row[2] == 'True' if has_training else None)
+
+
+def parse_block(block: str, task: Task, training: bool) -> Record:
+    """Sentence of a block of 'token TAG' lines written by converter.convert_message_lines."""
+    lines = block.split('\n') if block else []
+    intent = None
+    if task != Task.NER and lines:
+        intent = lines[0].split(' ', 1)[1]
+        lines = lines[1:]
+    tokens = []
+    entities = []
+    length = -1  # length of the text so far, without the space before the first token
+    for line in lines:
+        token, tag = line.rsplit(' ', 1)
+        start = length + 1
+        length = start + len(token)
+        tokens.append(token)
+        if tag.startswith('B-') or (tag.startswith('I-') and not entities):
+            entities.append(create_entity(start, length, tag[2:], token))
+        elif tag.startswith('I-'):
+            entity = entities[-1]
+            entity['value'] += ' ' + token
+            entity['end'] = length
+    return ' '.join(tokens), build_data(intent, entities, training)
+
+
+def iter_blocks(filename: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Streams the blocks of a NER file, reading chunk_size characters at a time."""
+    with open(str(filename), 'r', encoding='utf8', newline='') as f:
+        remainder = ''
+        for chunk in iter(lambda: f.read(chunk_size), ''):
+            blocks = (remainder + chunk).split(SEPARATOR)
+            remainder = blocks.pop()
+            yield from blocks
+        if remainder or f.tell():
+            yield remainder
+
+
+def iter_ner(filename: Path, task: Task, training: bool = None) -> Iterator[Record]:
+    """Streams the sentences of a NER file for task, training defaults to whether filename is a train file."""
+    training = filename.name.startswith('train') if training is None else training
+    return (parse_block(block, task, training) for block in iter_blocks(filename))
+
+
+def iter_chunks(records: Iterator[Record], size: int) -> Iterator[List[Record]]:
+    """Lists of size records, the last one can be shorter."""
+    records = iter(records)
+    return iter(lambda: list(islice(records, size)), [])
+
+
+def read_tsv(filename: Path, corpus: Corpus = None) -> CompactCorpus:
+    return CompactCorpus.from_records(iter_tsv(filename), corpus)
+
+
+def read_ner(directory: Path, task: Task, corpus: Corpus = None) -> CompactCorpus:
+    """Sentences of train.txt followed by those of test.txt in directory."""
+    def records() -> Iterator[Record]:
+        yield from iter_ner(directory / 'train.txt', task, True)
+        yield from iter_ner(directory / 'test.txt', task, False)
+
+    return CompactCorpus.from_records(records(), corpus)
+
+
+def check_tsv(corpus: Corpus, filename: Path) -> List[int]:
+    """Indices of the sentences of corpus which are not read back from filename as they were written.
+
+    Texts are compared without brackets. Sentences which had brackets or an entity not covering its value in the
+    text can not be written losslessly and are reported.
+    """
+    from nlu_datasets.utils import get_corpus
+
+    compact = get_corpus(corpus)
+    mismatches = []
+    records = iter_tsv(filename)
+    for i in range(len(compact)):
+        text, data = next(records, (None, {}))
+        expected = compact.get_data(i)
+        expected.pop('corpus', None)
+        expected['entities'] = sorted(expected.get('entities', []), key=lambda e: e['start'])
+        data.setdefault('entities', [])
+        if text != remove_brackets(compact.get_text(i)) or data != expected:
+            mismatches.append(i)
+    if next(records, None) is not None:
+        mismatches.append(len(compact))
+    return mismatches
+
+
+def check_ner(corpus: Corpus, task: Task, directory: Path) -> List[int]:
+    """Indices of the sentences of corpus which do not convert to the same lines once read back from directory.
+
+    Indices are counted in the order of read_ner, first the training then the test sentences.
+    """
+    from nlu_datasets.converter import convert_message_lines
+    from nlu_datasets.utils import get_corpus
+
+    compact = get_corpus(corpus)
+    expected = [i for training in [True, False] for i in range(len(compact)) if compact.is_training(i) == training]
+    read = read_ner(directory, task, corpus)
+    mismatches = [i for i, j in enumerate(expected[:len(read)])
+                  if convert_message_lines(task, read[i], corpus=corpus) != convert_message_lines(
+                      task, compact[j], corpus=corpus)]
+    if len(read) != len(expected):
+        mismatches.append(min(len(read), len(expected)))
+    return mismatches
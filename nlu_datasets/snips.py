@@ -1,16 +1,31 @@
 import operator
+import re
 import pathlib
 import typing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from itertools import accumulate, chain
-from typing import List, Iterable
+from typing import List, Iterable, TYPE_CHECKING
 from nlu_datasets.my_types import Corpus
 import nlu_datasets.utils  # from ... import ... will cause circular imports
-from rasa_nlu.training_data.message import Message
+from nlu_datasets.json_stream import iter_array
 
+if TYPE_CHECKING:  # rasa_nlu is only imported once messages are built
+    from rasa_nlu.training_data.message import Message
 
-def get_folders(corpus: Corpus) -> Iterable[pathlib.Path]:
-    """Get all folders listed in some corpus folder."""
-    return filter(lambda f: f.is_dir(), nlu_datasets.utils.get_path(corpus).glob('./*'))
+
+def get_folders(corpus: Corpus) -> List[pathlib.Path]:
+    """Get all folders listed in some corpus folder, sorted by name to read intents in the same order everywhere."""
+    return sorted(filter(lambda f: f.is_dir(), nlu_datasets.utils.get_path(corpus).glob('./*')))
+
+
+SURROGATES = re.compile('[\ud800-\udfff]')
+
+
+def join_surrogates(text: str) -> str:
+    """Joins utf16 surrogate pairs, the _full files encode characters outside the BMP as two utf8 surrogates."""
+    if not SURROGATES.search(text):
+        return text
+    return text.encode('utf-16', 'surrogatepass').decode('utf-16', 'surrogatepass')
 
 
 def convert_data_text(data: List[dict]) -> str:
@@ -33,29 +48,49 @@ def convert_data_entities(data: List[dict]) -> Iterable[dict]:
             yield nlu_datasets.utils.create_entity(start=span[0], end=span[1], entity=item['entity'], value=item['text'])
 
 
-def convert_data_message(corpus: Corpus, intent: str, data: List[dict], train: bool) -> Message:
+def convert_data_message(corpus: Corpus, intent: str, data: List[dict], train: bool) -> 'Message':
     """Returns message in decapitalized Rasa representation for some SNIPS data element."""
+    data = [dict(item, text=join_surrogates(item['text'])) for item in data]
     text = convert_data_text(data)
     entities = list(convert_data_entities(data))
     return nlu_datasets.utils.create_message(text.lower(), intent, entities, train, corpus)
 
 
-def convert_file_messages(corpus: Corpus, file: pathlib.Path, intent: str, train: bool) -> Iterable[Message]:
-    """Returns messages in Rasa representation for some SNIPS .json file."""
-    js = nlu_datasets.utils.convert_json_dict(file)
-    return map(lambda item: convert_data_message(corpus, intent, item['data'], train), js[intent])
+def convert_file_messages(corpus: Corpus, file: pathlib.Path, intent: str, train: bool) -> Iterable['Message']:
+    """Returns messages in Rasa representation for some SNIPS .json file.
+
+    The file is streamed, messages are produced while it is being read.
+    """
+    return map(lambda item: convert_data_message(corpus, intent, item['data'], train), iter_array(file, intent))
+
+
+def get_filename(corpus: Corpus, intent: str, train: bool) -> str:
+    """Name of the train or test file for intent, SNIPS2017_FULL trains on the _full files."""
+    if not train:
+        return 'validate_{}.json'.format(intent)
+    return ('train_{}_full.json' if corpus == Corpus.SNIPS2017_FULL else 'train_{}.json').format(intent)
+
+
+def convert_file_list(args: typing.Tuple[Corpus, pathlib.Path, str, bool]) -> List['Message']:
+    """convert_file_messages for the pools in read_snips2017, takes a single tuple and returns a list."""
+    return list(convert_file_messages(*args))
+
 
+executors = {
+    'thread': ThreadPoolExecutor,
+    'process': ProcessPoolExecutor
+}
 
-def read_snips2017(corpus: Corpus) -> Iterable[Message]:
-    def get_train_test_messages(folder: pathlib.Path, train: bool) -> Iterable[Message]:
-        intent = folder.name
-        filename = 'train_{}.json' if train else 'validate_{}.json'
-        path = folder / filename.format(intent)
-        return convert_file_messages(corpus, path, intent, train=train)
 
-    def get_messages(folder: pathlib.Path) -> Iterable[Message]:
-        return chain(get_train_test_messages(folder, train=True), get_train_test_messages(folder, train=False))
+def read_snips2017(corpus: Corpus, workers: int = 1, executor: str = 'thread') -> Iterable['Message']:
+    """Reads SNIPS2017 or SNIPS2017_FULL.
 
-    folders = get_folders(corpus)
-    nested_messages = map(lambda folder: get_messages(folder), folders)
-    return chain.from_iterable(nested_messages)
+    With more than one worker the train and test file of every intent are read concurrently on a pool of
+    workers, executor is either 'thread' or 'process'. Messages are in the same order for any number of workers.
+    """
+    files = [(corpus, folder / get_filename(corpus, folder.name, train), folder.name, train)
+             for folder in get_folders(corpus) for train in [True, False]]
+    if workers == 1:
+        return chain.from_iterable(map(lambda args: convert_file_messages(*args), files))
+    with executors[executor](max_workers=workers) as pool:
+        return list(chain.from_iterable(pool.map(convert_file_list, files)))  # map keeps the order of files
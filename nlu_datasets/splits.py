@@ -0,0 +1,144 @@
+"""Reproducible train / test splits over cached corpora.
+
+Splits are arrays of sentence indices into a CompactCorpus, stratified by intent so that every part has about the
+same intent distribution as the complete corpus. A CorpusView gives access to the sentences of a split without
+copying them. Folds can be saved to a small json file, so that the same folds are used across runs. The file stores a
+digest of the sentences in order and is refused once the corpus changed, its indices would point to other sentences.
+"""
+import hashlib
+import json
+import random
+from array import array
+from itertools import accumulate
+from pathlib import Path
+from typing import Iterator, List, Sequence, Tuple, TYPE_CHECKING
+
+from nlu_datasets.compact import CompactCorpus
+from nlu_datasets.my_types import Corpus
+
+if TYPE_CHECKING:  # rasa_nlu is only imported once messages are built
+    from rasa_nlu.training_data.message import Message
+
+Fold = Tuple[array, array]  # (train indices, test indices)
+
+
+class CorpusView:
+    """Sentences at indices of compact, indexing returns Message views like CompactCorpus."""
+
+    def __init__(self, compact: CompactCorpus, indices: Sequence[int]):
+        self.compact = compact
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, i: int) -> 'Message':
+        return self.compact.get_message(self.indices[i])
+
+    def __iter__(self) -> Iterator['Message']:
+        return map(self.compact.get_message, self.indices)
+
+    def get_texts(self) -> List[str]:
+        return [self.compact.get_text(i) for i in self.indices]
+
+    def get_intents(self) -> List[str]:
+        return [self.compact.get_intent(i) for i in self.indices]
+
+
+def group_by_intent(compact: CompactCorpus, seed: int) -> List[List[int]]:
+    """Sentence indices per intent code, each group shuffled by a random generator seeded with seed."""
+    groups = [[] for _ in compact.intents]
+    for i, code in enumerate(compact.intent_codes):
+        groups[code].append(i)
+    rng = random.Random(seed)
+    for group in groups:
+        rng.shuffle(group)
+    return groups
+
+
+def predefined_split(compact: CompactCorpus) -> Fold:
+    """Split defined by the training flag of the sentences."""
+    train, test = array('i'), array('i')
+    for i, training in enumerate(compact.training):
+        (train if training else test).append(i)
+    return train, test
+
+
+def stratified_kfold(compact: CompactCorpus, k: int, seed: int) -> List[Fold]:
+    """k folds where each sentence is in the test indices of exactly one fold."""
+    if not 2 <= k <= len(compact):
+        raise ValueError('k should be between 2 and the number of sentences, got {}'.format(k))
+    tests = [[] for _ in range(k)]
+    offset = 0  # continues dealing where the previous intent stopped, keeping the fold sizes within one
+    for group in group_by_intent(compact, seed):
+        for j, i in enumerate(group):
+            tests[(offset + j) % k].append(i)
+        offset = (offset + len(group)) % k
+    return folds_from_tests(len(compact), tests)
+
+
+def folds_from_tests(n: int, tests: List[Sequence[int]]) -> List[Fold]:
+    """Folds for the test indices of every fold, the train indices are all other sentences."""
+    fold_of = array('i', [0]) * n
+    for fold, test in enumerate(tests):
+        for i in test:
+            fold_of[i] = fold
+    return [(array('i', (i for i in range(n) if fold_of[i] != fold)), array('i', sorted(test)))
+            for fold, test in enumerate(tests)]
+
+
+def stratified_split(compact: CompactCorpus, ratios: Sequence[float], seed: int) -> List[array]:
+    """Indices of every part, for example ratios (0.8, 0.1, 0.1) for a train, dev and test split."""
+    total = sum(ratios)
+    bounds = [cumulative / total for cumulative in accumulate(ratios)]
+    parts = [[] for _ in ratios]
+    for group in group_by_intent(compact, seed):
+        start = 0
+        for part, bound in zip(parts, bounds):
+            end = round(len(group) * bound)
+            part.extend(group[start:end])
+            start = end
+    return [array('i', sorted(part)) for part in parts]
+
+
+def get_digest(compact: CompactCorpus) -> str:
+    """sha256 of the text, intent and training flag of every sentence in order."""
+    sha = hashlib.sha256()
+    for i in range(len(compact)):
+        line = '{}\t{}\t{}\n'.format(compact.get_text(i), compact.get_intent(i), compact.is_training(i))
+        sha.update(line.encode('utf8'))
+    return sha.hexdigest()
+
+
+def save_folds(path: Path, folds: List[Fold], **metadata):
+    """Stores the test indices of folds, metadata describes the folds and should include n, the corpus size."""
+    data = dict(metadata, tests=[fold[1].tolist() for fold in folds])
+    with open(str(path), 'w', encoding='utf8') as f:
+        json.dump(data, f, separators=(',', ':'))
+
+
+def load_folds(path: Path, **metadata) -> List[Fold]:
+    """Folds stored by save_folds, raises ValueError when the stored metadata differs from metadata."""
+    with open(str(path), 'r', encoding='utf8') as f:
+        data = json.load(f)
+    stored = {key: data.get(key) for key in metadata}
+    if stored != metadata:
+        raise ValueError('{} contains folds for {}, expected {}'.format(path, stored, metadata))
+    return folds_from_tests(data['n'], data['tests'])
+
+
+def get_kfold(corpus: Corpus, k: int, seed: int, path: Path = None) -> List[Fold]:
+    """stratified_kfold of the cached corpus, loaded from path when it exists or else computed and saved to path.
+
+    Raises ValueError when path holds folds of other parameters or of a corpus whose sentences changed.
+    """
+    from nlu_datasets.utils import get_corpus
+
+    compact = get_corpus(corpus)
+    metadata = {'corpus': corpus.name, 'n': len(compact), 'k': k, 'seed': seed, 'digest': get_digest(compact)}
+    if path is not None and path.is_file():
+        return load_folds(path, **metadata)
+    folds = stratified_kfold(compact, k, seed)
+    if path is not None:
+        save_folds(path, folds, **metadata)
+    return folds
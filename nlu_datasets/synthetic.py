@@ -0,0 +1,186 @@
+"""Generates large synthetic corpora in the native JSON formats of NLU-Evaluation Corpora and SNIPS 2017.
+
+Every sentence of a bundled corpus is a template, its entities are slots which are filled with random values of the
+same entity type from the same corpus. Sentences are written while they are generated, so memory use only depends on
+the size of the source corpus. The same seed always produces the same files.
+
+Run with `python -m nlu_datasets.synthetic chatbot 1000000 chatbot.json` or, for SNIPS, with an output directory
+which gets one folder per intent like data/snips2017/original. With --data-dir the corpus is written where
+utils.get_path(corpus, data_dir) expects it, so it is read by get_messages with NLU_DATASETS_DATA_DIR set to data_dir.
+"""
+import argparse
+import json
+import random
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import nlu_datasets.utils
+from nlu_datasets.corpora import convert_nlu_evaluation_entity, get_source_spans
+from nlu_datasets.json_stream import iter_array
+from nlu_datasets.my_types import Corpus
+from nlu_datasets.snips import get_filename, get_folders, join_surrogates
+
+Chunk = Tuple[str, Optional[str]]  # (text, entity type or None for text between entities)
+Template = Tuple[str, Tuple[Chunk, ...]]  # (intent, chunks)
+Sentence = Tuple[str, List[Chunk], bool]  # (intent, chunks, training)
+
+SNIPS = [Corpus.SNIPS2017, Corpus.SNIPS2017_FULL]
+BUFFER_SIZE = 1 << 16
+DEFAULT_TRAIN_RATIO = 0.8
+
+
+def split_text(text: str, entities: Sequence[dict]) -> Tuple[Chunk, ...]:
+    """Chunks of text for entities having character start and end indices, see utils.create_entity."""
+    chunks = []
+    position = 0
+    for entity in sorted(entities, key=lambda e: e['start']):
+        if entity['start'] < position:
+            continue  # overlapping entities can not be filled independently
+        if entity['start'] > position:
+            chunks.append((text[position:entity['start']], None))
+        chunks.append((text[entity['start']:entity['end']], entity['entity']))
+        position = entity['end']
+    if position < len(text):
+        chunks.append((text[position:], None))
+    return tuple(chunks)
+
+
+def read_nlu_evaluation_templates(corpus: Corpus) -> Iterator[Template]:
+    for sentence in nlu_datasets.utils.convert_json_dict(nlu_datasets.utils.get_path(corpus))['sentences']:
+        spans = get_source_spans(sentence['text'])
+        entities = [convert_nlu_evaluation_entity(sentence['text'], e, spans) for e in sentence['entities']]
+        yield sentence['intent'], split_text(sentence['text'], entities)
+
+
+def read_snips_templates(corpus: Corpus) -> Iterator[Template]:
+    for folder in get_folders(corpus):
+        for item in iter_array(folder / get_filename(corpus, folder.name, True), folder.name):
+            yield folder.name, tuple((join_surrogates(chunk['text']), chunk.get('entity')) for chunk in item['data'])
+
+
+def get_templates(corpus: Corpus) -> Tuple[List[Template], Dict[str, List[str]]]:
+    """Templates and the distinct values of every entity type in corpus."""
+    templates = list(read_snips_templates(corpus) if corpus in SNIPS else read_nlu_evaluation_templates(corpus))
+    values = {}
+    for _, chunks in templates:
+        for text, entity in chunks:
+            if entity is not None:
+                values.setdefault(entity, set()).add(text)
+    return templates, {entity: sorted(texts) for entity, texts in values.items()}
+
+
+def generate_sentences(templates: Sequence[Template], values: Dict[str, Sequence[str]], n: int, seed: int = 0,
+                       train_ratio: float = DEFAULT_TRAIN_RATIO) -> Iterator[Sentence]:
+    """Lazily samples n sentences, each one is in the training set with probability train_ratio."""
+    rng = random.Random(seed)
+    for _ in range(n):
+        intent, chunks = rng.choice(templates)
+        filled = [(rng.choice(values[entity]), entity) if entity is not None else (text, None)
+                  for text, entity in chunks]
+        yield intent, filled, rng.random() < train_ratio
+
+
+def convert_nlu_evaluation_sentence(sentence: Sentence) -> dict:
+    """Sentence in the format of the NLU-Evaluation Corpora, entities are given by token indices."""
+    intent, chunks, training = sentence
+    text = ''.join(chunk for chunk, _ in chunks)
+    spans = get_source_spans(text)
+    entities = []
+    position = 0
+    for chunk, entity in chunks:
+        start, end = position, position + len(chunk)
+        position = end
+        tokens = [i for i, span in enumerate(spans) if span[0] < end and span[1] > start]
+        if entity is not None and tokens:
+            entities.append({'entity': entity, 'start': tokens[0], 'stop': tokens[-1], 'text': chunk})
+    return {'text': text, 'intent': intent, 'entities': entities, 'training': training}
+
+
+def convert_snips_item(sentence: Sentence) -> dict:
+    _, chunks, _ = sentence
+    return {'data': [{'text': text, 'entity': entity} if entity is not None else {'text': text}
+                     for text, entity in chunks]}
+
+
+def write_nlu_evaluation(sentences: Iterator[Sentence], filename: Path, name: str):
+    """Streams sentences to a single file like data/chatbot/original/ChatbotCorpus.json."""
+    with open(str(filename), 'w', encoding='utf8', buffering=BUFFER_SIZE) as f:
+        f.write('{{"name": {}, "desc": "Synthetic corpus, see nlu_datasets.synthetic", "lang": "en", '
+                '"sentences": [\n'.format(json.dumps(name)))
+        separator = ''
+        for sentence in sentences:
+            f.write(separator)
+            f.write(json.dumps(convert_nlu_evaluation_sentence(sentence), ensure_ascii=False))
+            separator = ',\n'
+        f.write('\n]}\n')
+
+
+def write_snips(sentences: Iterator[Sentence], directory: Path, corpus: Corpus = Corpus.SNIPS2017,
+                intents: Iterable[str] = ()):
+    """Streams sentences to directory/<intent>/ having the train and test file names of corpus.
+
+    Both files are written for intents and for every intent of sentences, even if one of them gets no sentence, as
+    the SNIPS readers expect.
+    """
+    with ExitStack() as stack:
+        files = {}
+        separators = {}
+
+        def open_files(intent: str):
+            folder = directory / intent
+            folder.mkdir(parents=True, exist_ok=True)
+            for training in [True, False]:
+                key = (intent, training)
+                files[key] = stack.enter_context(open(str(folder / get_filename(corpus, intent, training)), 'w',
+                                                      encoding='utf8', buffering=BUFFER_SIZE))
+                files[key].write('{{{}: [\n'.format(json.dumps(intent)))
+                separators[key] = ''
+
+        for intent in intents:
+            open_files(intent)
+        for intent, chunks, training in sentences:
+            key = (intent, training)
+            if key not in files:
+                open_files(intent)
+            files[key].write(separators[key])
+            files[key].write(json.dumps(convert_snips_item((intent, chunks, training)), ensure_ascii=False))
+            separators[key] = ',\n'
+        for f in files.values():
+            f.write('\n]}\n')
+
+
+def generate_corpus(corpus: Corpus, n: int, output: Path, seed: int = 0, train_ratio: float = DEFAULT_TRAIN_RATIO):
+    """Writes n sentences sampled from corpus to output, a directory for SNIPS and a file for the other corpora."""
+    templates, values = get_templates(corpus)
+    sentences = generate_sentences(templates, values, n, seed, train_ratio)
+    if corpus in SNIPS:
+        write_snips(sentences, output, corpus, sorted({intent for intent, _ in templates}))
+    else:
+        write_nlu_evaluation(sentences, output, 'Synthetic' + corpus.name.capitalize())
+
+
+def main(args: List[str] = None):
+    from nlu_datasets.generate import parse_corpus
+
+    parser = argparse.ArgumentParser(description='Generate a synthetic corpus from the templates of a corpus.')
+    parser.add_argument('corpus', type=parse_corpus, help='corpus to take templates and entity values from')
+    parser.add_argument('n', type=int, help='number of sentences')
+    parser.add_argument('output', type=Path, nargs='?', default=None,
+                        help='output file, or directory for snips2017 and snips2017_full')
+    parser.add_argument('--data-dir', type=Path, default=None,
+                        help='write to the source path of corpus below this directory instead of output')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--train-ratio', type=float, default=DEFAULT_TRAIN_RATIO,
+                        help='fraction of training sentences, default %(default)s')
+    parsed = parser.parse_args(args)
+    if (parsed.output is None) == (parsed.data_dir is None):
+        parser.error('give either output or --data-dir')
+    output = parsed.output if parsed.output else nlu_datasets.utils.get_path(parsed.corpus, parsed.data_dir)
+    if parsed.corpus not in SNIPS:
+        output.parent.mkdir(parents=True, exist_ok=True)
+    generate_corpus(parsed.corpus, parsed.n, output, parsed.seed, parsed.train_ratio)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""Exports a corpus as integer encoded NumPy arrays, so that training jobs can start without any text processing.
+
+Tokens and tags are the same as in the generated NER files. Sentences are grouped into buckets by length and every
+bucket is padded only up to its own maximum length. Each array is saved as a separate .npy file, unlike .npz these
+can be memory-mapped by load_tensors.
+
+Layout of an export directory:
+    vocabulary.json           tokens, tags, intents and the names of the buckets
+    <bucket>.<field>.npy      fields: ids, lengths, training, tokens, and tags and / or intents depending on the task
+"""
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple, TYPE_CHECKING
+
+from nlu_datasets.converter import convert_message_tokens
+from nlu_datasets.my_types import Corpus, Task
+
+if TYPE_CHECKING:
+    import numpy as np
+    from nlu_datasets.compact import CompactCorpus
+
+PAD = '<pad>'  # id 0 for tokens and tags
+UNKNOWN = '<unk>'  # id 1 for tokens which are not in the vocabulary
+DEFAULT_BUCKETS = (8, 16, 32, 64)  # maximum lengths, longer sentences go to one last bucket
+
+
+def tokenize_corpus(compact: 'CompactCorpus', task: Task, corpus: Corpus = None) -> List[Tuple[List[str], List[str]]]:
+    """Tokens and tags of every sentence, truncated to the same length like the lines of the NER files.
+
+    corpus selects the tokenizer and defaults to compact.corpus, which is not set for the NLU-Evaluation Corpora.
+    """
+    tokenized = []
+    for message in compact:
+        tokens, tags = convert_message_tokens(task, message, corpus=corpus if corpus else compact.corpus)
+        n = min(len(tokens), len(tags))
+        tokenized.append((tokens[:n], tags[:n]))
+    return tokenized
+
+
+def build_vocabulary(sentences: Iterable[List[str]], reserved: Sequence[str] = (PAD, UNKNOWN)) -> List[str]:
+    """reserved followed by all tokens from most to least frequent, ties in alphabetical order."""
+    counts = Counter(token for sentence in sentences for token in sentence)
+    return list(reserved) + sorted(counts, key=lambda token: (-counts[token], token))
+
+
+def get_bucket(length: int, buckets: Sequence[int]) -> int:
+    """Index of the first bucket which fits length, len(buckets) for longer sentences."""
+    for i, maximum in enumerate(buckets):
+        if length <= maximum:
+            return i
+    return len(buckets)
+
+
+def encode_corpus(compact: 'CompactCorpus', task: Task, buckets: Sequence[int] = DEFAULT_BUCKETS,
+                  vocabulary: List[str] = None,
+                  corpus: Corpus = None) -> Tuple[dict, Dict[str, Dict[str, 'np.ndarray']]]:
+    """Returns the vocabularies and the arrays per bucket name.
+
+    The token vocabulary is built from the training sentences unless it is given, other tokens get the id of UNKNOWN.
+    corpus selects the tokenizer like for tokenize_corpus.
+    """
+    import numpy as np
+
+    tokenized = tokenize_corpus(compact, task, corpus)
+    if vocabulary is None:
+        vocabulary = build_vocabulary(tokens for i, (tokens, _) in enumerate(tokenized) if compact.training[i])
+    token_ids = {token: i for i, token in enumerate(vocabulary)}
+    tag_names = [PAD] + sorted(set(tag for _, tags in tokenized for tag in tags))
+    tag_ids = {tag: i for i, tag in enumerate(tag_names)}
+
+    members = [[] for _ in range(len(buckets) + 1)]
+    for i, (tokens, _) in enumerate(tokenized):
+        members[get_bucket(len(tokens), buckets)].append(i)
+
+    arrays = {}
+    for bucket, ids in enumerate(members):
+        if not ids:
+            continue
+        lengths = np.array([len(tokenized[i][0]) for i in ids], dtype=np.int32)
+        width = int(lengths.max()) if bucket == len(buckets) else buckets[bucket]
+        fields = {
+            'ids': np.array(ids, dtype=np.int32),
+            'lengths': lengths,
+            'training': np.array([compact.training[i] for i in ids], dtype=bool),
+            'tokens': np.zeros((len(ids), width), dtype=np.int32)
+        }
+        if task != Task.INTENT:
+            fields['tags'] = np.zeros((len(ids), width), dtype=np.int16)
+        if task != Task.NER:
+            fields['intents'] = np.array([compact.intent_codes[i] for i in ids], dtype=np.int16)
+        for row, i in enumerate(ids):
+            tokens, tags = tokenized[i]
+            fields['tokens'][row, :len(tokens)] = [token_ids.get(token, 1) for token in tokens]
+            if 'tags' in fields:
+                fields['tags'][row, :len(tags)] = [tag_ids[tag] for tag in tags]
+        arrays['bucket{}'.format(width)] = fields
+
+    meta = {'task': task.name, 'tokens': vocabulary, 'tags': tag_names if task != Task.INTENT else [],
+            'intents': list(compact.intents) if task != Task.NER else [], 'buckets': list(arrays)}
+    return meta, arrays
+
+
+def save_tensors(directory: Path, meta: dict, arrays: Dict[str, Dict[str, 'np.ndarray']]):
+    import numpy as np
+
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(str(directory / 'vocabulary.json'), 'w', encoding='utf8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    for bucket, fields in arrays.items():
+        for field, values in fields.items():
+            np.save(str(directory / '{}.{}.npy'.format(bucket, field)), values)
+
+
+def load_tensors(directory: Path, mmap: bool = True) -> Tuple[dict, Dict[str, Dict[str, 'np.ndarray']]]:
+    """Loads an export of save_tensors, memory-mapping the arrays read-only unless mmap is False."""
+    import numpy as np
+
+    with open(str(directory / 'vocabulary.json'), 'r', encoding='utf8') as f:
+        meta = json.load(f)
+    arrays = {}
+    for bucket in meta['buckets']:
+        arrays[bucket] = {}
+        for path in directory.glob(bucket + '.*.npy'):
+            field = path.name[len(bucket) + 1:-len('.npy')]
+            arrays[bucket][field] = np.load(str(path), mmap_mode='r' if mmap else None)
+    return meta, arrays
+
+
+def export_tensors(corpus: Corpus, task: Task, directory: Path, buckets: Sequence[int] = DEFAULT_BUCKETS):
+    """Encodes the cached corpus for task and saves the arrays to directory."""
+    from nlu_datasets.utils import get_corpus
+
+    meta, arrays = encode_corpus(get_corpus(corpus), task, buckets, corpus=corpus)
+    save_tensors(directory, meta, arrays)
@@ -0,0 +1,48 @@
+"""Tokenizers computing the character spans of tokens, without importing nltk.
+
+The default is WORD_PUNCT, which returns the same spans as nltk.tokenize.WordPunctTokenizer. Other tokenizers can be
+registered per corpus with register_tokenizer. They are used for all span computations of that corpus. Register them
+before the corpus is loaded, and at module level when corpora are generated with worker processes.
+"""
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from nlu_datasets.my_types import Corpus
+
+Span = Tuple[int, int]
+
+
+class RegexTokenizer:
+    """Tokens are the matches of pattern, like nltk.tokenize.RegexpTokenizer with gaps=False."""
+
+    def __init__(self, name: str, pattern: str, flags: int = re.UNICODE | re.MULTILINE | re.DOTALL):
+        self.name = name  # part of the disk cache key of corpora tokenized with this tokenizer
+        self.regex = re.compile(pattern, flags)
+
+    def span_tokenize(self, text: str) -> List[Span]:
+        return [match.span() for match in self.regex.finditer(text)]
+
+    def span_tokenize_many(self, texts: Sequence[str]) -> List[List[Span]]:
+        """span_tokenize for every text in texts."""
+        finditer = self.regex.finditer
+        return [[match.span() for match in finditer(text)] for text in texts]
+
+
+WORD_PUNCT = RegexTokenizer('wordpunct', r'\w+|[^\w\s]+')
+
+tokenizers = {}  # type: Dict[Corpus, RegexTokenizer]
+
+
+def register_tokenizer(corpus: Corpus, tokenizer: Optional[RegexTokenizer]):
+    """Use tokenizer for corpus, None restores the default.
+
+    Any object having a name, span_tokenize and span_tokenize_many like RegexTokenizer can be registered.
+    """
+    if tokenizer is None:
+        tokenizers.pop(corpus, None)
+    else:
+        tokenizers[corpus] = tokenizer
+
+
+def get_tokenizer(corpus: Optional[Corpus] = None) -> RegexTokenizer:
+    return tokenizers.get(corpus, WORD_PUNCT)
@@ -1,14 +1,15 @@
-from functools import lru_cache
-
-from rasa_nlu.training_data.formats.markdown import MarkdownWriter
-from rasa_nlu.training_data import Message, TrainingData
-from typing import Iterable, Tuple, List
-from nlu_datasets.corpora import read_nlu_evaluation_corpora
-import pandas as pd
+from typing import Iterable, Tuple, List, TYPE_CHECKING
 import json
+import os
 from pathlib import Path
+from nlu_datasets.markdown import annotate_corpus, annotate_message, annotate_messages
+from nlu_datasets.memory_cache import CorpusCache
 from nlu_datasets.my_types import Corpus
-from tests.utils import get_mock_messages
+
+if TYPE_CHECKING:  # heavy dependencies are imported by the functions which need them
+    import pandas as pd
+    from rasa_nlu.training_data.message import Message
+    from nlu_datasets.compact import CompactCorpus
 
 
 def get_project_root() -> Path:
@@ -22,16 +23,27 @@ def convert_json_dict(file: Path) -> dict:
         return json.load(f)
 
 
-def get_path(corpus: Corpus) -> Path:
+def get_data_dir() -> Path:
+    """Directory of the corpus sources, data/ unless NLU_DATASETS_DATA_DIR is set.
+
+    Corpora which were already loaded stay in corpus_cache when the directory changes, see CorpusCache.invalidate.
+    """
+    directory = os.environ.get('NLU_DATASETS_DATA_DIR')
+    return Path(directory) if directory else get_project_root() / 'data'
+
+
+def get_path(corpus: Corpus, data_dir: Path = None) -> Path:
+    """Source file of corpus, or the folder of its intent folders for SNIPS, data_dir defaults to get_data_dir()."""
     if corpus == Corpus.MOCK:
         raise AssertionError('This function should not be called on {}.'.format(corpus))
     paths = {
         Corpus.ASKUBUNTU: Path('askubuntu') / 'original' / 'AskUbuntuCorpus.json',
         Corpus.CHATBOT: Path('chatbot') / 'original' / 'ChatbotCorpus.json',
         Corpus.WEBAPPLICATIONS: Path('webapplications') / 'original' / 'WebApplicationsCorpus.json',
-        Corpus.SNIPS2017: Path('snips2017') / 'original'
+        Corpus.SNIPS2017: Path('snips2017') / 'original',
+        Corpus.SNIPS2017_FULL: Path('snips2017') / 'original'
     }
-    return get_project_root() / 'data' / paths[corpus]
+    return (data_dir if data_dir else get_data_dir()) / paths[corpus]
 
 
 def create_entity(start: int, end: int, entity: str, value: str) -> dict:
@@ -39,53 +51,118 @@ def create_entity(start: int, end: int, entity: str, value: str) -> dict:
     return {'start': start, 'end': end, 'entity': entity, 'value': value}
 
 
-def create_message(text: str, intent: str, entities: List[dict], training: bool, corpus: Corpus) -> Message:
+def create_message(text: str, intent: str, entities: List[dict], training: bool, corpus: Corpus) -> 'Message':
+    from rasa_nlu.training_data.message import Message
+
     message = Message.build(text=text, intent=intent, entities=entities)
     message.data['training'] = training
     message.data['corpus'] = corpus
     return message
 
 
-def convert_message_annotated(message: Message) -> str:
+def convert_message_annotated(message: 'Message') -> str:
     """Convert Message object to string having annotated entities."""
-    training_examples = [message]
-    training_data = TrainingData(training_examples)
-    generated = MarkdownWriter()._generate_training_examples_md(training_data)
-    generated = generated[generated.find('\n') + 3:-1]  # removing header
-    return generated
+    return annotate_message(message)
 
 
-def convert_messages_dataframe(messages: Iterable[Message], annotated_str=False) -> pd.DataFrame:
+def convert_messages_dataframe(messages: Iterable['Message'], annotated_str=False) -> 'pd.DataFrame':
     """ Returns a DataFrame (table) from a list of Message objects which can be used for visualisation."""
+    import pandas as pd
+
     pd.set_option('max_colwidth', 180)
 
-    data = {'message': [], 'intent': [], 'training': []}
-    for message in messages:
-        data['message'].append(convert_message_annotated(message) if annotated_str else message.text)
-        data['intent'].append(message.data['intent'])
-        data['training'].append(message.data['training'])
+    messages = list(messages)
+    data = {
+        'message': annotate_messages(messages) if annotated_str else [message.text for message in messages],
+        'intent': [message.data['intent'] for message in messages],
+        'training': [message.data['training'] for message in messages]
+    }
     return pd.DataFrame(data)
 
 
-@lru_cache()
-def get_messages(corpus: Corpus) -> Tuple[Message, ...]:
-    """Get all messages: Message from some file containing corpus and cache the messages."""
+def convert_corpus_dataframe(compact: 'CompactCorpus', annotated_str=False) -> 'pd.DataFrame':
+    """ Returns the same table as convert_messages_dataframe, built column by column from the arrays of compact.
+
+    The intent column is a Categorical. Unlike convert_messages_dataframe, no pandas options are changed.
+    """
+    import numpy as np
+    import pandas as pd
+
+    intent_codes = np.frombuffer(compact.intent_codes, dtype=np.uint16).astype(np.int32)
+    return pd.DataFrame({
+        'message': annotate_corpus(compact) if annotated_str else compact.get_texts(),
+        'intent': pd.Categorical.from_codes(intent_codes, categories=compact.intents),
+        'training': np.frombuffer(compact.training, dtype=np.int8).astype(bool)
+    })
+
+
+def convert_corpus_entities_dataframe(compact: 'CompactCorpus') -> 'pd.DataFrame':
+    """ Returns one row per entity in long format, the sentence column is the row in convert_corpus_dataframe. """
+    import numpy as np
+    import pandas as pd
+
+    offsets = np.frombuffer(compact.entity_offsets, dtype=np.int32)
+    value_offsets = compact.value_offsets
+    type_codes = np.frombuffer(compact.entity_type_codes, dtype=np.uint16).astype(np.int32)
+    return pd.DataFrame({
+        'sentence': np.repeat(np.arange(len(compact)), np.diff(offsets)),
+        'start': np.frombuffer(compact.entity_starts, dtype=np.int32),
+        'end': np.frombuffer(compact.entity_ends, dtype=np.int32),
+        'entity': pd.Categorical.from_codes(type_codes, categories=compact.entity_types),
+        'value': [compact.values[value_offsets[j]:value_offsets[j + 1]] for j in range(len(type_codes))]
+    })
+
+
+def load_corpus(corpus: Corpus) -> 'CompactCorpus':
+    """Get all sentences from some file containing corpus in compact form, using the disk cache but not corpus_cache.
+
+    Parsed corpora are cached on disk for other processes, see nlu_datasets.disk_cache.
+    """
+    from nlu_datasets.compact import CompactCorpus
+    from nlu_datasets.corpora import read_nlu_evaluation_corpora
     from nlu_datasets.snips import read_snips2017
+    from nlu_datasets import disk_cache
 
+    if corpus == Corpus.MOCK:
+        from nlu_datasets.mock import get_mock_records
+        return CompactCorpus.from_records(get_mock_records(corpus), corpus)
     functions = {  # all functions should have type: Corpus -> Iterable[Message]
-        Corpus.MOCK: get_mock_messages,
         Corpus.WEBAPPLICATIONS: read_nlu_evaluation_corpora,
         Corpus.CHATBOT: read_nlu_evaluation_corpora,
         Corpus.ASKUBUNTU: read_nlu_evaluation_corpora,
-        Corpus.SNIPS2017: read_snips2017
+        Corpus.SNIPS2017: read_snips2017,
+        Corpus.SNIPS2017_FULL: read_snips2017
     }
-    return tuple(functions[corpus](corpus))
+    return disk_cache.load(corpus, functions[corpus])
+
+
+corpus_cache = CorpusCache(load_corpus)
+
+
+def get_corpus(corpus: Corpus) -> 'CompactCorpus':
+    """Get all sentences of corpus in compact form, cached in memory by corpus_cache, see nlu_datasets.memory_cache.
+
+    Use corpus_cache.invalidate(corpus) to load a corpus again and corpus_cache.stats() for its hits and misses.
+    """
+    return corpus_cache.get(corpus)
+
+
+def get_messages(corpus: Corpus) -> Tuple['Message', ...]:
+    """Get all messages: Message from some file containing corpus.
+
+    Only the compact form of the corpus is cached, every call returns new Message objects.
+    """
+    return get_corpus(corpus).to_messages()
+
 
+def get_filtered_messages(corpus: Corpus, train: bool) -> Iterable['Message']:
+    from nlu_datasets.splits import CorpusView, predefined_split
 
-def get_filtered_messages(corpus: Corpus, train: bool) -> Iterable[Message]:
-    return filter(lambda m: train == m.data['training'], get_messages(corpus))
+    compact = get_corpus(corpus)
+    return iter(CorpusView(compact, predefined_split(compact)[0 if train else 1]))
 
 
 def get_intents(corpus: Corpus) -> Iterable[str]:
     """ Returns intent for each message in some corpus. To get unique intents one can simply cast it to a set. """
-    return map(lambda m: m.data['intent'], get_messages(corpus))
+    compact = get_corpus(corpus)
+    return map(compact.get_intent, range(len(compact)))
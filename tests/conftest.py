@@ -0,0 +1,19 @@
+import os
+import shutil
+import tempfile
+
+_cache_dir = None
+
+
+def pytest_configure(config):
+    """Keeps the disk cache of the test run out of ~/.cache unless NLU_DATASETS_CACHE_DIR is set."""
+    global _cache_dir
+    if 'NLU_DATASETS_CACHE_DIR' not in os.environ:
+        _cache_dir = tempfile.mkdtemp(prefix='nlu_datasets_cache')
+        os.environ['NLU_DATASETS_CACHE_DIR'] = _cache_dir
+
+
+def pytest_unconfigure(config):
+    if _cache_dir is not None:
+        del os.environ['NLU_DATASETS_CACHE_DIR']
+        shutil.rmtree(_cache_dir, ignore_errors=True)
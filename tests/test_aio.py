@@ -0,0 +1,61 @@
+import asyncio
+import threading
+import time
+
+import nlu_datasets.aio
+from nlu_datasets.aio import aget_corpus, aget_messages, aiter_messages
+from nlu_datasets.my_types import Corpus
+from nlu_datasets.utils import get_corpus, get_messages
+
+
+def test_aget_messages():
+    messages = asyncio.run(aget_messages(Corpus.CHATBOT))
+    assert [m.as_dict() for m in get_messages(Corpus.CHATBOT)] == [m.as_dict() for m in messages]
+
+
+def test_aiter_messages():
+    async def collect():
+        return [message.as_dict() async for message in aiter_messages(Corpus.MOCK, chunk_size=3)]
+
+    assert [m.as_dict() for m in get_messages(Corpus.MOCK)] == asyncio.run(collect())
+
+
+def test_single_flight(monkeypatch):
+    calls = []
+
+    def slow_get_corpus(corpus):
+        calls.append(threading.current_thread())
+        time.sleep(0.05)
+        return get_corpus(corpus)
+
+    monkeypatch.setattr(nlu_datasets.aio, 'get_corpus', slow_get_corpus)
+
+    async def load():
+        ticks = 0
+
+        async def tick():  # the loop keeps running while the corpus is loaded
+            nonlocal ticks
+            for _ in range(3):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        results = await asyncio.gather(*[aget_corpus(Corpus.ASKUBUNTU) for _ in range(5)], tick())
+        return results[:5], ticks
+
+    results, ticks = asyncio.run(load())
+    assert 1 == len(calls) and calls[0] is not threading.main_thread()
+    assert all(result is results[0] for result in results)
+    assert 3 == ticks
+    asyncio.run(aget_corpus(Corpus.ASKUBUNTU))
+    assert 2 == len(calls)  # the load is not in flight anymore
+
+
+def test_cancel_one_caller():
+    async def load():
+        first = asyncio.ensure_future(aget_corpus(Corpus.WEBAPPLICATIONS))
+        second = asyncio.ensure_future(aget_corpus(Corpus.WEBAPPLICATIONS))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert get_corpus(Corpus.WEBAPPLICATIONS) is asyncio.run(load())
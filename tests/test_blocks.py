@@ -0,0 +1,56 @@
+import pytest
+
+from nlu_datasets.blocks import BlockReader, BlockWriter, build_index, get_index_path
+from nlu_datasets.utils import get_project_root
+
+generated = get_project_root() / 'generated'
+
+
+def write_blocks(filename, blocks):
+    with BlockWriter(filename) as writer:
+        for block in blocks:
+            writer.write(block)
+
+
+def test_write_read(tmp_path):
+    blocks = ['INTENT a\nwort O', 'äöü B-x', '', 'last']
+    filename = tmp_path / 'train.txt'
+    write_blocks(filename, blocks)
+    assert '\n\n'.join(blocks) == filename.read_text(encoding='utf8')
+    with BlockReader(filename) as reader:
+        assert 4 == len(reader)
+        assert blocks == list(reader)
+        assert 'last' == reader[-1]
+        assert blocks[1:3] == reader[1:3]
+        assert blocks[::2] == reader[::2]
+        assert '\n\n'.join(blocks[:2]).encode('utf8') == reader.get_bytes(0, 2)
+        with pytest.raises(IndexError):
+            reader[4]
+
+
+def test_empty(tmp_path):
+    filename = tmp_path / 'test.txt'
+    write_blocks(filename, [])
+    with BlockReader(filename) as reader:
+        assert [] == list(reader)
+
+
+def test_out_of_date(tmp_path):
+    filename = tmp_path / 'train.txt'
+    write_blocks(filename, ['a', 'b'])
+    filename.write_text('a\n\nbc', encoding='utf8')
+    with pytest.raises(ValueError):
+        BlockReader(filename)
+    build_index(filename)
+    with BlockReader(filename) as reader:
+        assert ['a', 'bc'] == list(reader)
+
+
+def test_generated_indices(tmp_path):
+    for filename in generated.glob('*/*/*.txt'):
+        with BlockReader(filename) as reader:
+            assert filename.read_text(encoding='utf8').split('\n\n') == list(reader)
+        copy = tmp_path / 'copy.txt'
+        copy.write_bytes(filename.read_bytes())
+        build_index(copy)
+        assert get_index_path(filename).read_bytes() == get_index_path(copy).read_bytes()
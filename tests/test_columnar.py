@@ -0,0 +1,46 @@
+import csv
+
+import pytest
+
+from nlu_datasets.generate import generate
+from nlu_datasets.my_types import Corpus
+from nlu_datasets.utils import get_corpus, get_project_root
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+from nlu_datasets.columnar import get_schema, to_parquet  # noqa: E402
+
+
+def test_to_parquet(tmp_path):
+    filename = tmp_path / 'chatbot.parquet'
+    to_parquet(Corpus.CHATBOT, filename, row_group_size=50)
+    compact = get_corpus(Corpus.CHATBOT)
+    file = pq.ParquetFile(str(filename))
+    assert get_schema() == file.schema_arrow
+    assert (len(compact) + 49) // 50 == file.num_row_groups
+
+    table = file.read()
+    assert compact.get_texts() == table.column('text').to_pylist()
+    assert [compact.get_intent(i) for i in range(len(compact))] == table.column('intent').to_pylist()
+    assert [compact.is_training(i) for i in range(len(compact))] == table.column('training').to_pylist()
+    assert [compact.get_entities(i) for i in range(len(compact))] == table.column('entities').to_pylist()
+
+    with open(str(get_project_root() / 'generated' / 'chatbot' / 'chatbot.tsv'), encoding='utf8', newline='') as f:
+        rows = list(csv.reader(f, delimiter='\t'))[1:]
+    assert [row[0] for row in rows] == table.column('annotated').to_pylist()
+
+
+def test_read_columns_of_row_group(tmp_path):
+    filename = tmp_path / 'mock.parquet'
+    to_parquet(Corpus.MOCK, filename, row_group_size=1)
+    row_group = pq.ParquetFile(str(filename)).read_row_group(1, columns=['intent'])
+    assert ['intent'] == row_group.schema.names
+    assert [get_corpus(Corpus.MOCK).get_intent(1)] == row_group.column('intent').to_pylist()
+
+
+def test_generate_parquet(tmp_path):
+    generate([Corpus.MOCK], tmp_path, workers=1, formats=['parquet'])
+    assert (tmp_path / 'mock' / 'mock.parquet').is_file()
+    assert not (tmp_path / 'mock' / 'mock.tsv').exists()
+    assert [] == generate([Corpus.MOCK], tmp_path, workers=1, formats=['parquet'])
@@ -0,0 +1,50 @@
+import pickle
+
+import nlu_datasets.utils  # avoiding ImportError
+from nlu_datasets.compact import CompactCorpus
+from nlu_datasets.corpora import read_nlu_evaluation_corpora
+from nlu_datasets.mock import get_mock_messages
+from nlu_datasets.my_types import Corpus
+from nlu_datasets.snips import read_snips2017
+
+
+def test_round_trip():
+    for corpus, reader in [(Corpus.MOCK, get_mock_messages), (Corpus.WEBAPPLICATIONS, read_nlu_evaluation_corpora),
+                           (Corpus.SNIPS2017, read_snips2017)]:
+        messages = tuple(reader(corpus))
+        compact = CompactCorpus.from_messages(messages)
+        assert len(messages) == len(compact)
+        assert messages == compact.to_messages()
+        assert [m.as_dict() for m in messages] == [m.as_dict() for m in compact]
+        assert messages[-1] == compact[-1]
+
+
+def test_columns():
+    compact = nlu_datasets.utils.get_corpus(Corpus.CHATBOT)
+    assert 'i want to go marienplatz' == compact.get_text(0)
+    assert 'FindConnection' == compact.get_intent(0)
+    assert not compact.is_training(0)
+    assert [{'start': 13, 'end': 24, 'entity': 'StationDest', 'value': 'marienplatz'}] == compact.get_entities(0)
+    assert ('DepartureTime', 'FindConnection') == tuple(sorted(compact.intents))
+    assert compact.corpus is None
+    assert nlu_datasets.utils.get_corpus(Corpus.MOCK).corpus == Corpus.MOCK
+
+
+def test_index_error():
+    compact = nlu_datasets.utils.get_corpus(Corpus.MOCK)
+    for i in [20, -21]:
+        try:
+            compact.get_text(i)
+            assert False
+        except IndexError:
+            pass
+
+
+def test_pickle():
+    compact = nlu_datasets.utils.get_corpus(Corpus.SNIPS2017)
+    assert compact.to_messages() == pickle.loads(pickle.dumps(compact)).to_messages()
+
+
+def test_memory():
+    compact = nlu_datasets.utils.get_corpus(Corpus.SNIPS2017)
+    assert compact.nbytes() / len(compact) < 256
@@ -1,11 +1,14 @@
 from nlu_datasets.utils import create_message
 from nlu_datasets.my_types import Corpus
 from nlu_datasets.converter import (
-    convert_message_lines, annotate_tokens_using_ner, annotate_entity_tokens, merge_spans, convert_messages_lines
+    convert_message_lines, annotate_tokens_using_ner, annotate_entity_tokens, merge_spans, convert_messages_lines,
+    write_messages_lines, write_ner, merge_span_counts
 )
+from nlu_datasets.my_types import Task
+import io
 import csv
 from pathlib import Path
-from nlu_datasets.utils import get_project_root
+from nlu_datasets.utils import get_project_root, get_messages
 
 message = create_message(text='Alternative to Facebook Messenger.',
                          intent='Find Alternative',
@@ -46,9 +49,25 @@ def test_merge_spans_advanced():
     assert actual == expected
 
 
+def test_merge_span_counts():
+    expected = [((0, 11), 1), ((12, 14), 1), ((15, 33), 2), ((33, 34), 1)]
+    assert merge_span_counts(spans, entities) == expected
+
+
 def test_annotate_tokens():
     expected = ['O', 'O', 'B-WebService', 'I-WebService', 'O']
     assert expected == annotate_tokens_using_ner(spans, entities)
+    assert expected == annotate_tokens_using_ner(spans, entities, message.text)
+
+
+def test_annotate_tokens_incorrect_start_index():
+    # Problem upgrading Ubuntu [9.10](UbuntuVersion:Ubuntu 9.10), the value has more tokens than the text
+    text = 'Problem upgrading Ubuntu 9.10'
+    test_spans = [(0, 7), (8, 17), (18, 24), (25, 26), (26, 27), (27, 29)]
+    test_entities = [{'start': 25, 'end': 29, 'entity': 'UbuntuVersion', 'value': 'Ubuntu 9.10'}]
+    expected = ['O', 'O', 'O', 'B-UbuntuVersion', 'I-UbuntuVersion', 'I-UbuntuVersion', 'I-UbuntuVersion']
+    assert expected == annotate_tokens_using_ner(test_spans, test_entities, text)
+    assert expected == annotate_tokens_using_ner(test_spans, test_entities)
 
 
 def test_convert_message_lines():
@@ -109,3 +128,18 @@ def test_tsv_read():
     files = ['askubuntu', 'chatbot', 'webapplications', 'snips2017']
     for file in files:
         helper(get_project_root() / 'generated' / file / str(file + '.tsv'))
+
+
+def test_write_messages_lines():
+    f = io.StringIO()
+    messages = get_messages(Corpus.CHATBOT)
+    write_messages_lines(Task.NER_INTENT, messages, f)
+    assert convert_messages_lines(Task.NER_INTENT, messages) == f.getvalue()
+
+
+def test_write_ner(tmp_path):
+    for task in Task:
+        write_ner(Corpus.MOCK, task, tmp_path / task.name)
+        for filename in ['train.txt', 'test.txt']:
+            expected = get_project_root() / 'generated' / 'mock' / task.name.lower() / filename
+            assert expected.read_bytes() == (tmp_path / task.name / filename).read_bytes()
@@ -1,5 +1,5 @@
 import nlu_datasets.utils  # not using from ... import ... to avoid ImportError
-from nlu_datasets.corpora import convert_index, convert_nlu_evaluation_entity
+from nlu_datasets.corpora import convert_index, convert_nlu_evaluation_entity, get_spans
 import typing
 from nlu_datasets.my_types import Corpus
 from rasa_nlu.training_data.message import Message
@@ -15,6 +15,16 @@ def test_convert_index():
     helper(sentence, 8, 29, start=False)
 
 
+def test_convert_index_shared_spans():
+    sentence = 'Upgrading from 11.10 to 12.04'
+    spans = get_spans(sentence)
+    assert [(0, 9), (10, 14), (15, 17), (17, 18), (18, 20), (21, 23), (24, 26), (26, 27), (27, 29)] == spans
+    assert 24 == convert_index(sentence, 6, start=True, spans=spans)
+    assert 29 == convert_index(sentence, 8, start=False, spans=spans)
+    entity = {"text": "12.04", "entity": "UbuntuVersion", "stop": 8, "start": 6}
+    assert convert_nlu_evaluation_entity(sentence, entity) == convert_nlu_evaluation_entity(sentence, entity, spans)
+
+
 def test_nlu_evaluation_entity_converter():
     def helper(text: str, entity: dict, expected: str):
         result = convert_nlu_evaluation_entity(text, entity)
@@ -0,0 +1,84 @@
+import math
+from collections import Counter, defaultdict
+
+import nlu_datasets.utils  # avoiding ImportError
+from nlu_datasets.dedup import (
+    UnionFind, find_exact_duplicates, find_near_duplicates, get_band_keys, get_shingles, jaccard, leakage_report,
+    normalize, report_corpus, report_messages
+)
+from nlu_datasets.my_types import Corpus
+
+texts = [
+    'When is the next train to Garching?',
+    'when is the next train to garching',
+    'when is the next train to garching forschungszentrum',
+    'i want to go marienplatz',
+    'Is there a Linux file manager with a proper drop-down tree view?',
+    '',
+    '?',
+]
+
+
+def test_normalize():
+    assert 'when is the next train to garching' == normalize(texts[0])
+    assert '' == normalize(texts[6])
+
+
+def test_find_exact_duplicates():
+    assert [[0, 1], [5, 6]] == find_exact_duplicates(texts)
+
+
+def test_find_near_duplicates():
+    assert [[0, 1, 2], [5, 6]] == find_near_duplicates(texts)
+    assert [[0, 1], [5, 6]] == find_near_duplicates(texts, threshold=0.95)
+
+
+def find_all_pairs(texts, threshold=0.7):
+    """Exact groups of find_near_duplicates, comparing every pair which can reach threshold (prefix filtering)."""
+    normalized = [normalize(text) for text in texts]
+    union_find = UnionFind(len(texts))
+    first = {}
+    for i, text in enumerate(normalized):
+        union_find.union(first.setdefault(text, i), i)
+    unique = [i for text, i in first.items() if text]
+    frequency = Counter(s for i in unique for s in get_shingles(normalized[i]))
+    index = defaultdict(list)
+    for i in unique:
+        shingles = get_shingles(normalized[i])
+        ordered = sorted(shingles, key=lambda s: (frequency[s], s))
+        prefix = ordered[:len(ordered) - math.ceil(threshold * len(ordered) - 1e-9) + 1]
+        for j in {j for s in prefix for j in index[s]}:
+            if jaccard(get_shingles(normalized[j]), shingles) >= threshold:
+                union_find.union(i, j)
+        for s in prefix:
+            index[s].append(i)
+    return union_find.groups()
+
+
+def test_find_near_duplicates_all_pairs():
+    for corpus in [Corpus.CHATBOT, Corpus.SNIPS2017]:
+        texts = nlu_datasets.utils.get_corpus(corpus).get_texts()
+        assert sorted(find_all_pairs(texts)) == sorted(find_near_duplicates(texts))
+
+
+def test_get_band_keys():
+    keys = get_band_keys([normalize(text) for text in texts[:5]], num_perm=16, bands=4)
+    assert (5, 4) == keys.shape
+    assert (keys[0] == keys[1]).all()
+    assert not (keys[0] == keys[3]).any()
+
+
+def test_leakage_report():
+    report = leakage_report(texts, [True, False, False, True, False, True, False])
+    assert 2 == report['exact_duplicate_groups'] and 2 == report['exact_duplicates']
+    assert 2 == report['exact_leaks']
+    assert 3 == report['near_leaks']
+    assert [texts[:3], texts[5:]] == report['examples']
+
+
+def test_report_corpus():
+    report = report_corpus(Corpus.CHATBOT)
+    assert 'chatbot' == report['corpus']
+    assert {k: v for k, v in report.items() if k != 'corpus'} == \
+        report_messages(nlu_datasets.utils.get_messages(Corpus.CHATBOT))
+    assert 0 < report['exact_leaks'] <= report['near_leaks'] <= report['test_sentences']
@@ -0,0 +1,72 @@
+import os
+
+from nlu_datasets import disk_cache
+from nlu_datasets.my_types import Corpus
+from nlu_datasets.corpora import read_nlu_evaluation_corpora
+
+
+def reader(corpus: Corpus):
+    reader.calls += 1
+    return read_nlu_evaluation_corpora(corpus)
+
+
+def test_load(tmp_path, monkeypatch):
+    monkeypatch.setenv('NLU_DATASETS_CACHE_DIR', str(tmp_path))
+    reader.calls = 0
+    expected = tuple(read_nlu_evaluation_corpora(Corpus.CHATBOT))
+    assert expected == disk_cache.load(Corpus.CHATBOT, reader).to_messages()
+    assert expected == disk_cache.load(Corpus.CHATBOT, reader).to_messages()
+    assert 1 == reader.calls
+    assert 1 == len(list(tmp_path.glob('chatbot-*.pickle')))
+
+
+def test_disabled(monkeypatch):
+    monkeypatch.setenv('NLU_DATASETS_CACHE_DIR', '')
+    assert disk_cache.get_cache_dir() is None
+    reader.calls = 0
+    disk_cache.load(Corpus.CHATBOT, reader)
+    disk_cache.load(Corpus.CHATBOT, reader)
+    assert 2 == reader.calls
+
+
+def test_invalid_entries(tmp_path, monkeypatch):
+    monkeypatch.setenv('NLU_DATASETS_CACHE_DIR', str(tmp_path))
+    key = disk_cache.get_key(Corpus.CHATBOT)
+    path = disk_cache.get_entry_path(tmp_path, Corpus.CHATBOT, key)
+    stale = disk_cache.get_entry_path(tmp_path, Corpus.CHATBOT, '0' * 64)
+    stale.write_bytes(b'')
+    path.write_bytes(b'not a pickle')
+    assert disk_cache.read_entry(path, key) is None
+
+    assert 206 == len(disk_cache.load(Corpus.CHATBOT, read_nlu_evaluation_corpora))
+    assert not stale.exists()
+    assert disk_cache.read_entry(path, '0' * 64) is None
+    assert disk_cache.read_entry(path, key) is not None
+
+
+def test_evict(tmp_path):
+    for i, name in enumerate(['a', 'b', 'c']):
+        path = tmp_path / (name + disk_cache.SUFFIX)
+        path.write_bytes(b'x' * 10)
+        os.utime(str(path), (i, i))
+    disk_cache.evict(tmp_path, 25)
+    assert ['b.pickle', 'c.pickle'] == sorted(p.name for p in tmp_path.iterdir())
+
+
+def test_reader_changed(monkeypatch):
+    key = disk_cache.get_key(Corpus.CHATBOT)
+    monkeypatch.setattr(disk_cache, 'READER_MODULES', disk_cache.READER_MODULES[:-1])
+    assert key != disk_cache.get_key(Corpus.CHATBOT)
+
+
+def test_read_only(tmp_path, monkeypatch):
+    monkeypatch.setenv('NLU_DATASETS_CACHE_DIR', str(tmp_path))
+    disk_cache.load(Corpus.CHATBOT, reader)
+
+    def utime(*args):
+        raise PermissionError(args[0])
+
+    monkeypatch.setattr(os, 'utime', utime)
+    reader.calls = 0
+    assert 206 == len(disk_cache.load(Corpus.CHATBOT, reader))
+    assert 0 == reader.calls
@@ -0,0 +1,37 @@
+from nlu_datasets.generate import generate, get_jobs, parse_args
+from nlu_datasets.my_types import Corpus
+from nlu_datasets.utils import get_project_root
+from pathlib import Path
+
+
+def assert_same_files(expected_dir: Path, actual_dir: Path):
+    for expected in filter(lambda p: p.is_file(), expected_dir.rglob('*')):
+        assert expected.read_bytes() == (actual_dir / expected.relative_to(expected_dir)).read_bytes()
+
+
+def test_get_jobs():
+    jobs = get_jobs([Corpus.MOCK, Corpus.CHATBOT], Path('out'))
+    assert [('ner', Corpus.MOCK, Path('out') / 'mock'), ('tsv', Corpus.MOCK, Path('out') / 'mock'),
+            ('ner', Corpus.CHATBOT, Path('out') / 'chatbot'), ('tsv', Corpus.CHATBOT, Path('out') / 'chatbot')] == jobs
+
+
+def test_parse_args():
+    parsed = parse_args(['chatbot', 'askubuntu', '-j', '2'])
+    assert [Corpus.CHATBOT, Corpus.ASKUBUNTU] == parsed.corpora
+    assert 2 == parsed.workers
+
+
+def test_generate_serial(tmp_path):
+    generate([Corpus.CHATBOT], tmp_path, workers=1)
+    assert_same_files(get_project_root() / 'generated' / 'chatbot', tmp_path / 'chatbot')
+
+
+def test_generate_parallel(tmp_path):
+    generate([Corpus.ASKUBUNTU, Corpus.WEBAPPLICATIONS], tmp_path, workers=2)
+    for name in ['askubuntu', 'webapplications']:
+        assert_same_files(get_project_root() / 'generated' / name, tmp_path / name)
+
+
+def test_parse_formats():
+    assert ['tsv', 'parquet'] == parse_args(['--format', 'tsv', '--format', 'parquet']).formats
+    assert parse_args([]).formats is None
@@ -0,0 +1,30 @@
+import subprocess
+import sys
+
+import nlu_datasets.utils
+from nlu_datasets.my_types import Corpus
+from nlu_datasets.utils import get_project_root
+
+modules = ['utils', 'corpora', 'snips', 'converter', 'markdown', 'manifest', 'disk_cache', 'generate', 'aio',
+           'readers', 'mock']
+heavy = {'pandas', 'numpy', 'rasa_nlu', 'nltk', 'tests'}
+
+
+def imported_packages(module: str, statement: str = 'pass') -> set:
+    """Top-level packages in sys.modules after importing module and running statement in a fresh interpreter."""
+    code = 'import sys, {}; {}; print(" ".join(sys.modules))'.format(module, statement)
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=str(get_project_root()),
+                                     universal_newlines=True)
+    return {name.split('.')[0] for name in output.split()}
+
+
+def test_lightweight_imports():
+    for module in modules:
+        assert set() == heavy & imported_packages('nlu_datasets.' + module), module
+
+
+def test_lightweight_loads():
+    nlu_datasets.utils.load_corpus(Corpus.CHATBOT)  # fills the disk cache
+    for corpus in [Corpus.MOCK, Corpus.CHATBOT]:
+        statement = 'nlu_datasets.utils.get_corpus(nlu_datasets.utils.Corpus.{})'.format(corpus.name)
+        assert set() == heavy & imported_packages('nlu_datasets.utils', statement), corpus
@@ -0,0 +1,36 @@
+import pickle
+
+import nlu_datasets.utils  # avoiding ImportError
+from nlu_datasets.my_types import Corpus
+
+compact = nlu_datasets.utils.get_corpus(Corpus.CHATBOT)
+index = compact.get_index()
+
+
+def brute_force(intent=None, entity=None, training=None):
+    def matches(i: int) -> bool:
+        return (intent is None or compact.get_intent(i) == intent) and \
+               (entity is None or entity in [e['entity'] for e in compact.get_entities(i)]) and \
+               (training is None or compact.is_training(i) == training)
+
+    return [i for i in range(len(compact)) if matches(i)]
+
+
+def test_query():
+    assert brute_force() == index.query()
+    for intent in compact.intents + ('missing',):
+        for entity in compact.entity_types + ('missing', None):
+            for training in [True, False, None]:
+                assert brute_force(intent, entity, training) == index.query(intent, entity, training)
+
+
+def test_entity_spans():
+    spans = index.get_entity_spans('StationDest')
+    assert (0, 13, 24) == spans[0]
+    assert (len(compact) - 1, 17, 31) == spans[-1]
+    assert [] == index.get_entity_spans('missing')
+
+
+def test_cached_with_corpus():
+    assert index is compact.get_index()
+    assert pickle.loads(pickle.dumps(compact)).inverted_index is None
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from nlu_datasets.json_stream import iter_array
+from nlu_datasets.utils import get_path
+from nlu_datasets.my_types import Corpus
+
+document = {'name': 'x', 'count': 12345, 'nested': {'a': [1, 2]}, 'items': [{'text': 'é ' * i} for i in range(20)]}
+
+
+def test_iter_array(tmp_path):
+    file = tmp_path / 'document.json'
+    file.write_text(json.dumps(document, indent=2), encoding='utf8')
+    for chunk_size in [1, 3, 64, 1 << 16]:
+        assert document['items'] == list(iter_array(file, 'items', chunk_size))
+
+
+def test_iter_array_empty_and_missing(tmp_path):
+    file = tmp_path / 'document.json'
+    file.write_text('{"a": 1, "items": [ ]}', encoding='utf8')
+    assert [] == list(iter_array(file, 'items', chunk_size=2))
+    with pytest.raises(KeyError):
+        list(iter_array(file, 'missing'))
+
+
+def test_iter_array_invalid(tmp_path):
+    file = tmp_path / 'document.json'
+    file.write_text('{"items": [1, 2 3]}', encoding='utf8')
+    with pytest.raises(ValueError):
+        list(iter_array(file, 'items', chunk_size=4))
+
+
+def test_iter_array_snips():
+    file = get_path(Corpus.SNIPS2017) / 'PlayMusic' / 'train_PlayMusic_full.json'
+    with open(str(file), 'rb') as f:
+        expected = json.load(f)['PlayMusic']
+    assert expected == list(iter_array(file, 'PlayMusic'))
@@ -0,0 +1,88 @@
+import pytest
+
+from nlu_datasets.generate import generate, main
+from nlu_datasets.manifest import (
+    get_source_files, build_entry, get_stale, read_manifest, write_manifest, CONVERTER_VERSION
+)
+from nlu_datasets.my_types import Corpus
+from nlu_datasets.tokenizer import RegexTokenizer, register_tokenizer
+from nlu_datasets.utils import get_project_root
+
+
+def test_get_source_files():
+    files = get_source_files(Corpus.SNIPS2017)
+    assert 14 == len(files)
+    assert 'train_AddToPlaylist.json' == files[0].name
+    assert [get_project_root() / 'data' / 'chatbot' / 'original' / 'ChatbotCorpus.json'] == \
+        get_source_files(Corpus.CHATBOT)
+
+
+def test_build_entry():
+    entry = build_entry(Corpus.CHATBOT)
+    assert CONVERTER_VERSION == entry['version']
+    assert 'wordpunct' == entry['tokenizer']
+    assert ['data/chatbot/original/ChatbotCorpus.json'] == list(entry['sources'])
+
+
+def test_committed_manifest_up_to_date():
+    assert [] == get_stale(Corpus, get_project_root() / 'generated')
+
+
+def test_incremental_generation(tmp_path):
+    corpora = [Corpus.MOCK, Corpus.CHATBOT]
+    assert corpora == generate(corpora, tmp_path, workers=1)
+    assert [] == get_stale(corpora, tmp_path)
+    assert [] == generate(corpora, tmp_path, workers=1)
+
+    manifest = read_manifest(tmp_path)
+    manifest['chatbot']['version'] = CONVERTER_VERSION - 1
+    write_manifest(tmp_path, manifest)
+    assert [Corpus.CHATBOT] == get_stale(corpora, tmp_path)
+
+    (tmp_path / 'mock' / 'mock.tsv').unlink()
+    assert corpora == generate(corpora, tmp_path, workers=1)
+
+
+def test_formats(tmp_path):
+    generate([Corpus.CHATBOT], tmp_path, workers=1)
+    manifest = read_manifest(tmp_path)
+    assert ['ner', 'tsv'] == manifest['chatbot']['formats']
+    manifest['chatbot']['sources']['data/chatbot/original/ChatbotCorpus.json'] = '0' * 64
+    write_manifest(tmp_path, manifest)
+    assert [Corpus.CHATBOT] == generate([Corpus.CHATBOT], tmp_path, workers=1, formats=['tsv'])
+    assert ['tsv'] == read_manifest(tmp_path)['chatbot']['formats']
+    assert [] == get_stale([Corpus.CHATBOT], tmp_path, ['tsv'])
+    assert [Corpus.CHATBOT] == get_stale([Corpus.CHATBOT], tmp_path)
+    generate([Corpus.CHATBOT], tmp_path, workers=1, formats=['ner'])
+    assert ['ner', 'tsv'] == read_manifest(tmp_path)['chatbot']['formats']
+    assert [] == get_stale([Corpus.CHATBOT], tmp_path, verify=True)
+
+
+def test_check(tmp_path):
+    with pytest.raises(SystemExit) as e:
+        main(['mock', '--check', '-o', str(tmp_path)])
+    assert 1 == e.value.code
+    generate([Corpus.MOCK], tmp_path, workers=1)
+    with pytest.raises(SystemExit) as e:
+        main(['mock', '--check', '-o', str(tmp_path)])
+    assert 0 == e.value.code
+    with open(str(tmp_path / 'mock' / 'ner' / 'test.txt'), 'a', encoding='utf8') as f:
+        f.write('\n\nedited O')
+    assert [] == get_stale([Corpus.MOCK], tmp_path)
+    with pytest.raises(SystemExit) as e:
+        main(['mock', '--check', '-o', str(tmp_path)])
+    assert 1 == e.value.code
+
+
+def test_committed_outputs_unchanged():
+    assert [] == get_stale(Corpus, get_project_root() / 'generated', verify=True)
+
+
+def test_tokenizer_changed(tmp_path):
+    generate([Corpus.MOCK], tmp_path, workers=1)
+    register_tokenizer(Corpus.MOCK, RegexTokenizer('words', r'\w+'))
+    try:
+        assert [Corpus.MOCK] == get_stale([Corpus.MOCK], tmp_path)
+    finally:
+        register_tokenizer(Corpus.MOCK, None)
+    assert [] == get_stale([Corpus.MOCK], tmp_path)
@@ -0,0 +1,34 @@
+import nlu_datasets.utils  # avoiding ImportError
+from nlu_datasets.markdown import annotate, annotate_corpus, annotate_message, annotate_messages, remove_brackets
+from nlu_datasets.my_types import Corpus
+from rasa_nlu.training_data import TrainingData
+from rasa_nlu.training_data.formats.markdown import MarkdownWriter
+from rasa_nlu.training_data.message import Message
+
+
+def rasa_annotated(message: Message) -> str:
+    """Reference implementation which was used before nlu_datasets.markdown."""
+    copy = Message(message.text, dict(message.data))
+    generated = MarkdownWriter()._generate_training_examples_md(TrainingData([copy]))
+    return generated[generated.find('\n') + 3:-1]  # removing header
+
+
+def test_annotate():
+    entities = [{'start': 16, 'end': 24, 'entity': 'city', 'value': 'Berlin'},
+                {'start': 0, 'end': 4, 'entity': 'verb', 'value': 'book'}]
+    expected = '[book](verb) a table in [berlin a](city:Berlin)'
+    assert expected == annotate('book a table in berlin a', entities)
+    assert 'no entities' == annotate('no entities', [])
+
+
+def test_remove_brackets():
+    assert 'a b c' == remove_brackets('a [b] (c)')
+
+
+def test_rasa_parity():
+    for corpus in Corpus:
+        messages = nlu_datasets.utils.get_messages(corpus)
+        expected = [rasa_annotated(message) for message in messages]
+        assert expected == annotate_messages(messages)
+        assert expected[-1] == annotate_message(messages[-1])
+        assert expected == annotate_corpus(nlu_datasets.utils.get_corpus(corpus))
@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+
+import nlu_datasets.utils
+from nlu_datasets.compact import CompactCorpus
+from nlu_datasets.memory_cache import CorpusCache
+from nlu_datasets.my_types import Corpus
+
+
+def make_loader(sizes=None, delay=0.0):
+    calls = []
+
+    def loader(corpus: Corpus) -> CompactCorpus:
+        calls.append(corpus)
+        time.sleep(delay)
+        compact = CompactCorpus(corpus)
+        compact.text = 'x' * (sizes or {}).get(corpus, 0)
+        return compact
+
+    return loader, calls
+
+
+def test_get():
+    loader, calls = make_loader()
+    cache = CorpusCache(loader, 1 << 20)
+    compact = cache.get(Corpus.CHATBOT)
+    assert compact is cache.get(Corpus.CHATBOT)
+    assert Corpus.CHATBOT in cache and Corpus.ASKUBUNTU not in cache
+    assert [Corpus.CHATBOT] == calls
+    stats = cache.stats()
+    assert (1, 1, 0, 1, compact.nbytes()) == (stats.hits, stats.misses, stats.evictions, stats.entries, stats.size)
+
+
+def test_eviction():
+    loader, calls = make_loader({Corpus.CHATBOT: 4000, Corpus.ASKUBUNTU: 4000, Corpus.WEBAPPLICATIONS: 4000,
+                                 Corpus.SNIPS2017: 20000})
+    cache = CorpusCache(loader, 10000)
+    cache.get(Corpus.CHATBOT)
+    cache.get(Corpus.ASKUBUNTU)
+    cache.get(Corpus.CHATBOT)  # ASKUBUNTU becomes the least recently used
+    cache.get(Corpus.WEBAPPLICATIONS)
+    assert Corpus.ASKUBUNTU not in cache and Corpus.CHATBOT in cache and Corpus.WEBAPPLICATIONS in cache
+    assert 1 == cache.stats().evictions and cache.stats().size <= 10000
+    cache.get(Corpus.SNIPS2017)  # larger than the budget
+    assert Corpus.SNIPS2017 not in cache and 2 == cache.stats().entries
+
+
+def test_invalidate_and_clear():
+    loader, calls = make_loader()
+    cache = CorpusCache(loader)
+    first = cache.get(Corpus.CHATBOT)
+    cache.get(Corpus.ASKUBUNTU)
+    assert cache.invalidate(Corpus.CHATBOT)
+    assert not cache.invalidate(Corpus.CHATBOT)
+    assert first is not cache.get(Corpus.CHATBOT)
+    cache.clear()
+    assert 0 == cache.stats().entries and 0 == cache.stats().size
+    assert 3 == cache.stats().misses
+
+
+def test_single_flight():
+    loader, calls = make_loader(delay=0.1)
+    cache = CorpusCache(loader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get(Corpus.CHATBOT))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert [Corpus.CHATBOT] == calls
+    assert 8 == len(results) and all(result is results[0] for result in results)
+    assert (7, 1) == (cache.stats().hits, cache.stats().misses)
+
+
+def test_failed_load():
+    def loader(corpus: Corpus) -> CompactCorpus:
+        loader.calls += 1
+        raise OSError('missing')
+
+    loader.calls = 0
+    cache = CorpusCache(loader)
+    for _ in range(2):
+        with pytest.raises(OSError):
+            cache.get(Corpus.CHATBOT)
+    assert 2 == loader.calls and Corpus.CHATBOT not in cache
+
+
+def test_get_corpus():
+    compact = nlu_datasets.utils.get_corpus(Corpus.MOCK)
+    assert compact is nlu_datasets.utils.get_corpus(Corpus.MOCK)
+    assert nlu_datasets.utils.corpus_cache.invalidate(Corpus.MOCK)
+    assert compact.to_messages() == nlu_datasets.utils.get_corpus(Corpus.MOCK).to_messages()
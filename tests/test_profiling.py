@@ -0,0 +1,57 @@
+import json
+
+import nlu_datasets.converter
+import nlu_datasets.markdown
+from nlu_datasets import profiling
+from nlu_datasets.generate import main
+from nlu_datasets.my_types import Corpus, Task
+from nlu_datasets.tokenizer import RegexTokenizer
+from nlu_datasets.utils import get_messages
+
+originals = [nlu_datasets.converter.convert_message_lines, nlu_datasets.converter.annotate,
+             nlu_datasets.markdown.annotate, RegexTokenizer.span_tokenize]
+
+
+def test_enable_disable(tmp_path):
+    profiling.reset()
+    profiling.enable()
+    try:
+        assert nlu_datasets.converter.annotate is nlu_datasets.markdown.annotate
+        assert nlu_datasets.markdown.annotate is not originals[2]
+        with profiling.scope(Corpus.MOCK):
+            nlu_datasets.converter.write_split_ner(get_messages(Corpus.MOCK), {Task.NER_INTENT: tmp_path})
+    finally:
+        profiling.disable()
+    assert originals == [nlu_datasets.converter.convert_message_lines, nlu_datasets.converter.annotate,
+                         nlu_datasets.markdown.annotate, RegexTokenizer.span_tokenize]
+
+    stages = {(s['corpus'], s['task'], s['function']): s for s in profiling.get_report()['stages']}
+    assert 20 == stages[('mock', 'ner_intent', 'convert_message_lines')]['sentences']
+    assert 20 == stages[('mock', None, 'RegexTokenizer.span_tokenize')]['calls']
+    written = stages[('mock', None, 'BlockWriter.write')]['bytes']
+    assert written == sum(f.stat().st_size for f in tmp_path.glob('*.txt')) - 2 * (20 - 2)  # without separators
+
+
+def test_count_written(tmp_path):
+    profiling.reset()
+    profiling.enable()
+    try:
+        with profiling.scope(Corpus.MOCK, Task.NER):
+            nlu_datasets.converter.write('text', tmp_path / 'a_long_file_name.txt')
+    finally:
+        profiling.disable()
+    [stage] = profiling.get_report()['stages']
+    assert ('mock', 'ner', 1, 4) == (stage['corpus'], stage['task'], stage['sentences'], stage['bytes'])
+
+
+def test_generate_profile(tmp_path):
+    profiling.reset()
+    main(['mock', '-o', str(tmp_path), '--profile', str(tmp_path / 'report.json'),
+          '--cprofile', str(tmp_path / 'run.prof')])
+    report = json.loads((tmp_path / 'report.json').read_text())
+    assert {'markdown', 'ner', 'tokenize', 'write'} <= {s['stage'] for s in report['stages']}
+    peaks = {(p['corpus'], p['task']): p['bytes'] for p in report['peak_bytes']}
+    assert {('mock', None)} | {('mock', task.name.lower()) for task in Task} == set(peaks)
+    assert all(0 < peaks[('mock', task.name.lower())] <= peaks[('mock', None)] for task in Task)
+    assert (tmp_path / 'run.prof').stat().st_size > 0
+    assert not profiling.is_enabled()
@@ -0,0 +1,65 @@
+import nlu_datasets.utils  # avoiding ImportError
+from nlu_datasets.markdown import annotate, remove_brackets
+from nlu_datasets.my_types import Corpus, Task
+from nlu_datasets.readers import (
+    check_ner, check_tsv, iter_blocks, iter_chunks, parse_annotated, parse_block, read_ner, read_tsv
+)
+
+generated = nlu_datasets.utils.get_project_root() / 'generated'
+
+
+def test_parse_annotated():
+    entities = [{'start': 13, 'end': 24, 'entity': 'StationDest', 'value': 'marienplatz'},
+                {'start': 28, 'end': 33, 'entity': 'TimeStartTime', 'value': '8 a.m.'}]
+    text = 'i want to go marienplatz at 8 am.'
+    annotated = annotate(text, entities)
+    assert 'i want to go [marienplatz](StationDest) at [8 am.](TimeStartTime:8 a.m.)' == annotated
+    assert (text, entities) == parse_annotated(annotated)
+
+
+def test_parse_block():
+    block = 'INTENT FindConnection\nto O\nkarl B-StationDest\n- I-StationDest\npreis I-StationDest'
+    text, data = parse_block(block, Task.NER_INTENT, False)
+    assert 'to karl - preis' == text
+    assert {'intent': 'FindConnection', 'training': False,
+            'entities': [{'start': 3, 'end': 15, 'entity': 'StationDest', 'value': 'karl - preis'}]} == data
+    assert ('', {'training': True}) == parse_block('', Task.NER, True)
+
+
+def test_iter_blocks(tmp_path):
+    filename = tmp_path / 'train.txt'
+    blocks = ['a O', '', 'b O\nc O', 'd O']
+    filename.write_text('\n\n'.join(blocks), encoding='utf8')
+    for chunk_size in [1, 2, 3, 100]:
+        assert blocks == list(iter_blocks(filename, chunk_size))
+
+
+def test_iter_chunks():
+    assert [[0, 1], [2, 3], [4]] == list(iter_chunks(range(5), 2))
+
+
+def test_read_tsv():
+    compact = read_tsv(generated / 'chatbot' / 'chatbot.tsv', Corpus.CHATBOT)
+    expected = nlu_datasets.utils.get_corpus(Corpus.CHATBOT)
+    assert expected.get_texts() == compact.get_texts()
+    assert Corpus.CHATBOT == compact.corpus
+
+
+def test_check_tsv():
+    assert [] == check_tsv(Corpus.CHATBOT, generated / 'chatbot' / 'chatbot.tsv')
+    compact = nlu_datasets.utils.get_corpus(Corpus.ASKUBUNTU)
+    lossy = [i for i, text in enumerate(compact.get_texts()) if any(  # brackets shift the entities after them
+        remove_brackets(text[:e['end']]) != text[:e['end']] or e['end'] > len(text) for e in compact.get_entities(i))]
+    assert lossy == check_tsv(Corpus.ASKUBUNTU, generated / 'askubuntu' / 'askubuntu.tsv')
+
+
+def test_check_ner():
+    for corpus in [Corpus.CHATBOT, Corpus.ASKUBUNTU, Corpus.WEBAPPLICATIONS, Corpus.SNIPS2017, Corpus.SNIPS2017_FULL]:
+        for task in Task:
+            assert [] == check_ner(corpus, task, generated / corpus.name.lower() / task.name.lower())
+
+
+def test_read_ner():
+    compact = read_ner(generated / 'mock' / 'ner_intent', Task.NER_INTENT)
+    assert [str(i) for i in range(20)] == compact.get_texts()
+    assert 15 == sum(compact.training)
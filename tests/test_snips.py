@@ -1,4 +1,6 @@
-from nlu_datasets.snips import get_folders, convert_data_spans, convert_data_message, convert_file_messages, read_snips2017
+from nlu_datasets.snips import (
+    get_folders, convert_data_spans, convert_data_message, convert_file_messages, read_snips2017, join_surrogates
+)
 import nlu_datasets.utils  # not using from ... import ... to avoid ImportError
 from nlu_datasets.my_types import Corpus
 
@@ -19,6 +21,7 @@ def test_get_folders():
     names = [folder.name for folder in get_folders(Corpus.SNIPS2017)]
     assert 7 == len(names)
     assert 'RateBook' in names
+    assert sorted(names) == names
 
 
 def test_convert_data_spans():
@@ -43,3 +46,21 @@ def test_convert_file_messages():
 def test_read_snips2017():
     messages = read_snips2017(corpus)
     assert 2100 + 700 == len(tuple(messages))
+
+
+def test_read_snips2017_full():
+    messages = tuple(read_snips2017(Corpus.SNIPS2017_FULL))
+    assert 13784 + 700 == len(messages)
+    assert 13784 == sum(m.data['training'] for m in messages)
+    assert Corpus.SNIPS2017_FULL == messages[0].data['corpus']
+
+
+def test_join_surrogates():
+    assert '\U0001f355 pizza' == join_surrogates('\ud83c\udf55 pizza')
+    assert 'pizza' == join_surrogates('pizza')
+
+
+def test_read_snips2017_concurrent():
+    expected = tuple(read_snips2017(corpus))
+    assert expected == tuple(read_snips2017(corpus, workers=4, executor='thread'))
+    assert expected == tuple(read_snips2017(corpus, workers=2, executor='process'))
@@ -0,0 +1,71 @@
+import json
+from collections import Counter
+
+import pytest
+
+import nlu_datasets.utils  # avoiding ImportError
+from nlu_datasets.my_types import Corpus
+from nlu_datasets.splits import (
+    CorpusView, predefined_split, stratified_kfold, stratified_split, get_digest, get_kfold, load_folds
+)
+
+compact = nlu_datasets.utils.get_corpus(Corpus.SNIPS2017)
+
+
+def test_predefined_split():
+    train, test = predefined_split(compact)
+    assert (2100, 700) == (len(train), len(test))
+    assert all(m.data['training'] for m in CorpusView(compact, train))
+
+
+def test_stratified_kfold():
+    folds = stratified_kfold(compact, 5, seed=42)
+    tests = [i for _, test in folds for i in test]
+    assert sorted(tests) == list(range(len(compact)))
+    for train, test in folds:
+        assert len(compact) == len(train) + len(test)
+        assert 560 == len(test)
+        assert {400 // 5} == set(Counter(CorpusView(compact, test).get_intents()).values())
+    assert folds == stratified_kfold(compact, 5, seed=42)
+    assert folds != stratified_kfold(compact, 5, seed=43)
+    with pytest.raises(ValueError):
+        stratified_kfold(compact, 1, seed=42)
+
+
+def test_stratified_split():
+    train, dev, test = stratified_split(compact, (0.8, 0.1, 0.1), seed=1)
+    assert (2240, 280, 280) == (len(train), len(dev), len(test))
+    assert not set(train) & set(dev) and not set(dev) & set(test)
+
+
+def test_corpus_view():
+    view = CorpusView(compact, [3, 1])
+    assert [compact[3], compact[1]] == list(view)
+    assert compact[1] == view[1]
+    assert [compact.get_text(3), compact.get_text(1)] == view.get_texts()
+
+
+def test_get_kfold(tmp_path):
+    path = tmp_path / 'folds.json'
+    folds = get_kfold(Corpus.CHATBOT, 3, seed=0, path=path)
+    assert path.is_file()
+    assert folds == get_kfold(Corpus.CHATBOT, 3, seed=0, path=path)
+    with pytest.raises(ValueError):
+        get_kfold(Corpus.CHATBOT, 4, seed=0, path=path)
+    with pytest.raises(ValueError):
+        load_folds(path, corpus='ASKUBUNTU')
+
+
+def test_get_kfold_changed_corpus(tmp_path):
+    path = tmp_path / 'folds.json'
+    get_kfold(Corpus.CHATBOT, 3, seed=0, path=path)
+    data = json.loads(path.read_text(encoding='utf8'))
+    assert get_digest(nlu_datasets.utils.get_corpus(Corpus.CHATBOT)) == data['digest']
+    data['digest'] = get_digest(compact)  # same size, but other sentences or order
+    path.write_text(json.dumps(data), encoding='utf8')
+    with pytest.raises(ValueError):
+        get_kfold(Corpus.CHATBOT, 3, seed=0, path=path)
+    del data['digest']  # saved before digests were stored
+    path.write_text(json.dumps(data), encoding='utf8')
+    with pytest.raises(ValueError):
+        get_kfold(Corpus.CHATBOT, 3, seed=0, path=path)
@@ -0,0 +1,61 @@
+import nlu_datasets.utils  # avoiding ImportError
+from nlu_datasets.corpora import convert_nlu_evaluation_entity
+from nlu_datasets.my_types import Corpus
+from nlu_datasets.snips import convert_file_messages, get_filename, read_snips2017
+from nlu_datasets.synthetic import generate_corpus, get_templates, main, split_text
+
+
+def test_split_text():
+    entities = [{'start': 13, 'end': 24, 'entity': 'StationDest', 'value': 'marienplatz'}]
+    assert (('i want to go ', None), ('marienplatz', 'StationDest')) == split_text('i want to go marienplatz', entities)
+
+
+def test_get_templates():
+    templates, values = get_templates(Corpus.CHATBOT)
+    assert 206 == len(templates)
+    assert 'marienplatz' in values['StationDest']
+
+
+def test_nlu_evaluation(tmp_path):
+    filename = tmp_path / 'chatbot.json'
+    generate_corpus(Corpus.CHATBOT, 500, filename, seed=1)
+    sentences = nlu_datasets.utils.convert_json_dict(filename)['sentences']
+    assert 500 == len(sentences)
+    _, values = get_templates(Corpus.CHATBOT)
+    for sentence in sentences:
+        for entity in sentence['entities']:
+            assert entity['text'] in values[entity['entity']]
+            converted = convert_nlu_evaluation_entity(sentence['text'], entity)
+            assert converted['value'] == sentence['text'][converted['start']:converted['end']]
+
+
+def test_snips(tmp_path):
+    generate_corpus(Corpus.SNIPS2017, 1000, tmp_path, seed=1)
+    messages = [message for folder in tmp_path.iterdir() for train in [True, False]
+                for message in convert_file_messages(Corpus.SNIPS2017, folder / get_filename(
+                    Corpus.SNIPS2017, folder.name, train), folder.name, train)]
+    assert 1000 == len(messages)
+    for message in messages:
+        for entity in message.data.get('entities', []):
+            assert entity['value'].lower() == message.text[entity['start']:entity['end']]
+
+
+def test_snips_few_sentences(tmp_path, monkeypatch):
+    generate_corpus(Corpus.SNIPS2017, 5, nlu_datasets.utils.get_path(Corpus.SNIPS2017, tmp_path), seed=1)
+    folders = list((tmp_path / 'snips2017' / 'original').iterdir())
+    assert 7 == len(folders) and all(2 == len(list(folder.iterdir())) for folder in folders)
+    monkeypatch.setenv('NLU_DATASETS_DATA_DIR', str(tmp_path))
+    assert 5 == len(list(read_snips2017(Corpus.SNIPS2017)))
+
+
+def test_data_dir(tmp_path, monkeypatch):
+    main(['chatbot', '300', '--data-dir', str(tmp_path)])
+    monkeypatch.setenv('NLU_DATASETS_DATA_DIR', str(tmp_path))
+    assert 300 == len(nlu_datasets.utils.load_corpus(Corpus.CHATBOT))
+
+
+def test_seed(tmp_path):
+    for name, seed in [('a.json', 2), ('b.json', 2), ('c.json', 3)]:
+        generate_corpus(Corpus.ASKUBUNTU, 100, tmp_path / name, seed=seed)
+    assert (tmp_path / 'a.json').read_bytes() == (tmp_path / 'b.json').read_bytes()
+    assert (tmp_path / 'a.json').read_bytes() != (tmp_path / 'c.json').read_bytes()
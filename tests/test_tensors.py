@@ -0,0 +1,74 @@
+import numpy as np
+
+import nlu_datasets.utils  # avoiding ImportError
+from nlu_datasets.converter import convert_message_lines, convert_message_tokens
+from nlu_datasets.my_types import Corpus, Task
+from nlu_datasets.tensors import (
+    build_vocabulary, get_bucket, encode_corpus, export_tensors, load_tensors, PAD, UNKNOWN
+)
+from nlu_datasets.tokenizer import RegexTokenizer, register_tokenizer
+
+compact = nlu_datasets.utils.get_corpus(Corpus.CHATBOT)
+
+
+def test_build_vocabulary():
+    assert [PAD, UNKNOWN, 'b', 'a', 'c'] == build_vocabulary([['c', 'b'], ['a', 'b']])
+
+
+def test_get_bucket():
+    assert [0, 0, 1, 2] == [get_bucket(n, (2, 4)) for n in [0, 2, 3, 5]]
+
+
+def test_encode_corpus_round_trip():
+    meta, arrays = encode_corpus(compact, Task.NER_INTENT)
+    decoded = {}
+    for bucket in arrays.values():
+        assert bucket['tokens'].shape == bucket['tags'].shape
+        assert bucket['lengths'].max() <= bucket['tokens'].shape[1]
+        for row, i in enumerate(bucket['ids']):
+            n = bucket['lengths'][row]
+            assert not bucket['tokens'][row, n:].any()
+            tokens = [meta['tokens'][t] for t in bucket['tokens'][row, :n]]
+            tags = [meta['tags'][t] for t in bucket['tags'][row, :n]]
+            intent = meta['intents'][bucket['intents'][row]].replace(' ', '')
+            decoded[i] = '\n'.join(['INTENT ' + intent] + ['{} {}'.format(*t) for t in zip(tokens, tags)])
+    assert len(compact) == len(decoded)
+    for i, message in enumerate(compact):
+        if compact.is_training(i):  # test sentences can contain unknown tokens
+            assert convert_message_lines(Task.NER_INTENT, message) == decoded[i]
+
+
+def test_tasks():
+    meta, arrays = encode_corpus(compact, Task.NER)
+    assert [] == meta['intents'] and all('intents' not in b and 'tags' in b for b in arrays.values())
+    meta, arrays = encode_corpus(compact, Task.INTENT)
+    assert [] == meta['tags'] and all('intents' in b and 'tags' not in b for b in arrays.values())
+
+
+def test_export_tensors(tmp_path):
+    export_tensors(Corpus.CHATBOT, Task.NER, tmp_path)
+    meta, arrays = encode_corpus(compact, Task.NER)
+    loaded_meta, loaded = load_tensors(tmp_path)
+    assert meta == loaded_meta
+    for bucket, fields in arrays.items():
+        assert set(fields) == set(loaded[bucket])
+        for field, values in fields.items():
+            assert isinstance(loaded[bucket][field], np.memmap)
+            assert np.array_equal(values, loaded[bucket][field])
+
+
+def test_export_tensors_tokenizer(tmp_path):
+    askubuntu = nlu_datasets.utils.get_corpus(Corpus.ASKUBUNTU)
+    register_tokenizer(Corpus.ASKUBUNTU, RegexTokenizer('fine', r'[^\W\d_]+|\d+|[^\w\s]'))
+    try:
+        export_tensors(Corpus.ASKUBUNTU, Task.NER, tmp_path)
+        expected = [convert_message_tokens(Task.NER, message, corpus=Corpus.ASKUBUNTU)[0] for message in askubuntu]
+    finally:
+        register_tokenizer(Corpus.ASKUBUNTU, None)
+    assert expected != [convert_message_tokens(Task.NER, message)[0] for message in askubuntu]
+    meta, arrays = load_tensors(tmp_path)
+    for bucket in arrays.values():
+        for row, i in enumerate(bucket['ids']):
+            if askubuntu.is_training(i):
+                tokens = [meta['tokens'][t] for t in bucket['tokens'][row, :bucket['lengths'][row]]]
+                assert expected[i][:len(tokens)] == tokens
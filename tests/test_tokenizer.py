@@ -0,0 +1,40 @@
+import nlu_datasets.utils  # avoiding ImportError
+from nlu_datasets.converter import convert_message_lines
+from nlu_datasets.my_types import Corpus, Task
+from nlu_datasets.tokenizer import RegexTokenizer, WORD_PUNCT, get_tokenizer, register_tokenizer
+
+
+def test_word_punct():
+    text = 'Good muffins cost $3.88\nin New York.  003½ Thanks.'
+    spans = WORD_PUNCT.span_tokenize(text)
+    assert ['Good', 'muffins', 'cost', '$', '3', '.', '88', 'in', 'New', 'York', '.', '003½', 'Thanks', '.'] == \
+        [text[start:end] for start, end in spans]
+
+
+def test_span_tokenize_many():
+    texts = ['upgrading from 11.10', '', 'to 12.04']
+    assert [WORD_PUNCT.span_tokenize(text) for text in texts] == WORD_PUNCT.span_tokenize_many(texts)
+
+
+def test_register_tokenizer():
+    message = nlu_datasets.utils.create_message('new-york city', 'A', [], True, Corpus.MOCK)
+    assert WORD_PUNCT is get_tokenizer(Corpus.MOCK)
+    register_tokenizer(Corpus.MOCK, RegexTokenizer('whitespace', r'\S+'))
+    try:
+        assert 'whitespace' == get_tokenizer(Corpus.MOCK).name
+        assert WORD_PUNCT is get_tokenizer(Corpus.CHATBOT)
+        assert 'new-york O\ncity O' == convert_message_lines(Task.NER, message)
+    finally:
+        register_tokenizer(Corpus.MOCK, None)
+    assert 'new O\n- O\nyork O\ncity O' == convert_message_lines(Task.NER, message)
+
+
+def test_registered_tokenizer_keeps_source_indices():
+    expected = nlu_datasets.utils.load_corpus(Corpus.CHATBOT)
+    register_tokenizer(Corpus.CHATBOT, RegexTokenizer('whitespace', r'\S+'))
+    try:
+        compact = nlu_datasets.utils.load_corpus(Corpus.CHATBOT)
+    finally:
+        register_tokenizer(Corpus.CHATBOT, None)
+    assert [expected.get_entities(i) for i in range(len(expected))] == \
+        [compact.get_entities(i) for i in range(len(compact))]
@@ -27,3 +27,22 @@ def test_get_filtered_messages():
     func = functools.partial(nlu_datasets.utils.get_filtered_messages, corpus=Corpus.MOCK)
     assert 15 == len(tuple(func(train=True)))
     assert 5 == len(tuple(func(train=False)))
+
+
+def test_convert_corpus_dataframe():
+    compact = nlu_datasets.utils.get_corpus(Corpus.SNIPS2017)
+    expected = nlu_datasets.utils.convert_messages_dataframe(compact, annotated_str=True)
+    actual = nlu_datasets.utils.convert_corpus_dataframe(compact, annotated_str=True)
+    assert list(expected['message']) == list(actual['message'])
+    assert list(expected['intent']) == list(actual['intent'])
+    assert list(expected['training']) == list(actual['training'])
+    assert set(compact.intents) == set(actual['intent'].cat.categories)
+
+
+def test_convert_corpus_entities_dataframe():
+    compact = nlu_datasets.utils.get_corpus(Corpus.CHATBOT)
+    entities = nlu_datasets.utils.convert_corpus_entities_dataframe(compact)
+    assert len(compact.entity_starts) == len(entities)
+    last = entities.iloc[-1]
+    assert [len(compact) - 1, 17, 31, 'StationDest', 'studentenstadt'] == \
+        [last['sentence'], last['start'], last['end'], last['entity'], last['value']]